@@ -3,25 +3,99 @@
 from __future__ import annotations
 
 import argparse
-import json
 import os
 import sys
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import cache
+from typing import TYPE_CHECKING, Any
 
-import yaml
+if TYPE_CHECKING:
+    from tree_sitter_mcp.project import ProjectAnalyzer
 
-from tree_sitter_mcp.project import ProjectAnalyzer
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+MAX_CACHED_PROJECTS = 8
+
+# (resolved path, jobs) -> project, in LRU order
+_projects: OrderedDict[tuple[str, int], ProjectAnalyzer] = OrderedDict()
+
+
+def _get_project(path: str, jobs: int = 1) -> ProjectAnalyzer:
+    """Get a ProjectAnalyzer for a resolved path, shared across commands in this process."""
+    key = (path, jobs)
+    project = _projects.get(key)
+    if project is not None:
+        _projects.move_to_end(key)
+        return project
+
+    # Deferred so --help and argument errors don't pay for loading tree-sitter grammars.
+    from tree_sitter_mcp.project import ProjectAnalyzer
+
+    project = ProjectAnalyzer(path, jobs=jobs)
+    _projects[key] = project
+    while len(_projects) > MAX_CACHED_PROJECTS:
+        _projects.popitem(last=False)
+    return project
+
+
+def _forget_project(path: str) -> None:
+    """Drop the shared ProjectAnalyzers of a resolved path."""
+    for key in [key for key in _projects if key[0] == path]:
+        del _projects[key]
 
 
 def _output_result(result: dict, output_format: str) -> None:
-    """Output result in specified format."""
+    """Output result in specified format; error results go to stderr."""
+    out = sys.stderr if "error" in result else sys.stdout
     if output_format == "json":
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        if orjson is not None:
+            data = orjson.dumps(result, option=orjson.OPT_INDENT_2) + b"\n"
+            buffer = getattr(out, "buffer", None)
+            if buffer is None:
+                # Text-only streams, e.g. StringIO or capture wrappers
+                out.write(data.decode("utf-8"))
+            else:
+                out.flush()
+                buffer.write(data)
+                buffer.flush()
+        else:
+            import json
+
+            json.dump(result, out, indent=2, ensure_ascii=False)
+            out.write("\n")
     elif output_format == "yaml":
-        print(yaml.dump(result, allow_unicode=True, default_flow_style=False, sort_keys=False))
+        import yaml
+
+        try:
+            from yaml import CSafeDumper as _YamlDumper
+        except ImportError:
+            from yaml import SafeDumper as _YamlDumper
+
+        yaml.dump(
+            result,
+            out,
+            Dumper=_YamlDumper,
+            allow_unicode=True,
+            default_flow_style=False,
+            sort_keys=False,
+        )
+        out.write("\n")
     else:
         _print_pretty(result)
 
 
+def _loc_template(items: list[dict], line_format: str) -> str:
+    """Pick the location template for a block once; items in a block all carry a file or none do."""
+    if items and items[0].get("file"):
+        return "{file}:" + line_format
+    return line_format
+
+
 def _print_pretty(result: dict) -> None:
     """Print result in a human-readable format."""
     if "error" in result:
@@ -30,125 +104,86 @@ def _print_pretty(result: dict) -> None:
 
     path = result.get("path", "")
     count = result.get("count", 0)
-
-    print(f"Path: {path}")
+    lines: list[str] = [f"Path: {path}"]
     if "files_searched" in result:
-        print(f"Files searched: {result['files_searched']}")
-    print(f"Count: {count}")
-    print("-" * 50)
+        lines.append(f"Files searched: {result['files_searched']}")
+    lines.append(f"Count: {count}")
+    lines.append("-" * 50)
 
     if "functions" in result:
-        for f in result["functions"]:
-            loc = f"L{f['start_line']}-{f['end_line']}"
-            file_info = f.get("file", "")
+        functions = result["functions"]
+        loc = _loc_template(functions, "L{start_line}-{end_line}")
+        for f in functions:
             class_info = f" ({f['class_name']})" if f.get("class_name") else ""
             method_tag = " [method]" if f.get("is_method") else ""
-            if file_info:
-                print(f"  {f['name']}{class_info}{method_tag} - {file_info}:{loc}")
-            else:
-                print(f"  {f['name']}{class_info}{method_tag} - {loc}")
+            lines.append(f"  {f['name']}{class_info}{method_tag} - {loc.format_map(f)}")
             if "body" in f:
-                print(f"    {f['body'][:100]}...")
+                lines.append(f"    {f['body'][:100]}...")
 
     if "classes" in result:
-        for c in result["classes"]:
-            loc = f"L{c['start_line']}-{c['end_line']}"
-            file_info = c.get("file", "")
-            if file_info:
-                print(f"  {c['name']} - {file_info}:{loc}")
-            else:
-                print(f"  {c['name']} - {loc}")
+        classes = result["classes"]
+        loc = _loc_template(classes, "L{start_line}-{end_line}")
+        for c in classes:
+            lines.append(f"  {c['name']} - {loc.format_map(c)}")
             if c.get("methods"):
-                print(f"    Methods: {', '.join(c['methods'])}")
+                lines.append(f"    Methods: {', '.join(c['methods'])}")
             if c.get("fields"):
-                print(f"    Fields: {', '.join(c['fields'])}")
+                lines.append(f"    Fields: {', '.join(c['fields'])}")
 
     if "fields" in result:
-        for f in result["fields"]:
+        fields = result["fields"]
+        loc = _loc_template(fields, "L{line}")
+        for f in fields:
             type_info = f" ({f['type']})" if f.get("type") else ""
-            file_info = f.get("file", "")
-            if file_info:
-                print(f"  {f['name']}{type_info} - {file_info}:L{f['line']}")
-            else:
-                print(f"  {f['name']}{type_info} - L{f['line']}")
+            lines.append(f"  {f['name']}{type_info} - {loc.format_map(f)}")
 
     if "imports" in result:
-        for i in result["imports"]:
-            file_info = i.get("file", "")
-            if file_info:
-                print(f"  {i['module']} - {file_info}:L{i['line']}")
-            else:
-                print(f"  {i['module']} - L{i['line']}")
+        imports = result["imports"]
+        loc = _loc_template(imports, "L{line}")
+        lines.extend(f"  {i['module']} - {loc.format_map(i)}" for i in imports)
 
     if "variables" in result:
-        for v in result["variables"]:
+        variables = result["variables"]
+        loc = _loc_template(variables, "L{line}")
+        for v in variables:
             scope = f" (scope: {v['scope']})" if v.get("scope") else " (global)"
-            file_info = v.get("file", "")
-            if file_info:
-                print(f"  {v['name']}{scope} - {file_info}:L{v['line']}")
-            else:
-                print(f"  {v['name']}{scope} - L{v['line']}")
+            lines.append(f"  {v['name']}{scope} - {loc.format_map(v)}")
 
     if "callers" in result:
-        func = result.get("function", "")
-        print(f"Callers of '{func}':")
-        for c in result["callers"]:
-            file_info = c.get("file", "")
-            if file_info:
-                print(f"  {c['caller']} - {file_info}:L{c['line']}")
-            else:
-                print(f"  {c['caller']} - L{c['line']}")
+        callers = result["callers"]
+        loc = _loc_template(callers, "L{line}")
+        lines.append(f"Callers of '{result.get('function', '')}':")
+        lines.extend(f"  {c['caller']} - {loc.format_map(c)}" for c in callers)
 
     if "callees" in result:
-        func = result.get("function", "")
-        print(f"Callees of '{func}':")
-        for c in result["callees"]:
-            file_info = c.get("file", "")
-            if file_info:
-                print(f"  {c['callee']} - {file_info}:L{c['line']}")
-            else:
-                print(f"  {c['callee']} - L{c['line']}")
+        callees = result["callees"]
+        loc = _loc_template(callees, "L{line}")
+        lines.append(f"Callees of '{result.get('function', '')}':")
+        lines.extend(f"  {c['callee']} - {loc.format_map(c)}" for c in callees)
 
     if "references" in result:
-        name = result.get("name", "")
-        print(f"References to '{name}':")
-        for r in result["references"]:
-            loc = r.get("location", {})
-            file_info = loc.get("file", "")
-            line = loc.get("start_line", "?")
-            if file_info:
-                print(f"  {r['type']} - {file_info}:L{line}")
-            else:
-                print(f"  {r['type']} - L{line}")
+        locations = [r["location"] for r in result["references"]]
+        loc = _loc_template(locations, "L{start_line}")
+        lines.append(f"References to '{result.get('name', '')}':")
+        lines.extend(
+            f"  {r['type']} - {loc.format_map(location)}"
+            for r, location in zip(result["references"], locations, strict=True)
+        )
 
     if "strings" in result:
-        for s in result["strings"]:
-            file_info = s.get("file", "")
+        strings = result["strings"]
+        loc = _loc_template(strings, "L{line}")
+        for s in strings:
             value = s["value"][:50] + "..." if len(s["value"]) > 50 else s["value"]
-            if file_info:
-                print(f"  {value} - {file_info}:L{s['line']}")
-            else:
-                print(f"  {value} - L{s['line']}")
-
-    if "super_classes" in result:
-        class_name = result.get("class_name", "")
-        print(f"Super classes of '{class_name}':")
-        for c in result["super_classes"]:
-            file_info = c.get("file", "")
-            if file_info:
-                print(f"  {c['name']} - {file_info}:L{c['start_line']}")
-            else:
-                print(f"  {c['name']} - L{c['start_line']}")
-
-    if "sub_classes" in result:
-        class_name = result.get("class_name", "")
-        print(f"Sub classes of '{class_name}':")
-        for c in result["sub_classes"]:
-            file_info = c.get("file", "")
-            if file_info:
-                print(f"  {c['name']} - {file_info}:L{c['start_line']}")
-            else:
-                print(f"  {c['name']} - L{c['start_line']}")
+            lines.append(f"  {value} - {loc.format_map(s)}")
+
+    for key, title in (("super_classes", "Super classes"), ("sub_classes", "Sub classes")):
+        if key in result:
+            loc = _loc_template(result[key], "L{start_line}")
+            lines.append(f"{title} of '{result.get('class_name', '')}':")
+            lines.extend(f"  {c['name']} - {loc.format_map(c)}" for c in result[key])
+
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def cmd_functions(args: argparse.Namespace) -> dict:
@@ -156,7 +191,7 @@ def cmd_functions(args: argparse.Namespace) -> dict:
     try:
         path = os.path.realpath(args.path)
         query = args.query or ""
-        project = ProjectAnalyzer(path)
+        project = _get_project(path, args.jobs)
         functions = project.get_functions(query=query)
         return {
             "path": path,
@@ -173,7 +208,7 @@ def cmd_classes(args: argparse.Namespace) -> dict:
     try:
         path = os.path.realpath(args.path)
         query = args.query or ""
-        project = ProjectAnalyzer(path)
+        project = _get_project(path, args.jobs)
         classes = project.get_classes(query=query)
         return {
             "path": path,
@@ -190,7 +225,7 @@ def cmd_fields(args: argparse.Namespace) -> dict:
     try:
         path = os.path.realpath(args.path)
         class_name = args.class_name
-        project = ProjectAnalyzer(path)
+        project = _get_project(path, args.jobs)
         fields = project.get_fields(class_name)
         return {
             "path": path,
@@ -208,7 +243,7 @@ def cmd_imports(args: argparse.Namespace) -> dict:
     try:
         path = os.path.realpath(args.path)
         query = args.query or ""
-        project = ProjectAnalyzer(path)
+        project = _get_project(path, args.jobs)
         imports = project.get_imports(query=query)
         return {
             "path": path,
@@ -225,7 +260,7 @@ def cmd_variables(args: argparse.Namespace) -> dict:
     try:
         path = os.path.realpath(args.path)
         query = args.query or ""
-        project = ProjectAnalyzer(path)
+        project = _get_project(path, args.jobs)
         variables = project.get_variables(query=query)
         return {
             "path": path,
@@ -243,7 +278,7 @@ def cmd_callers(args: argparse.Namespace) -> dict:
         path = os.path.realpath(args.path)
         function_name = args.function
         class_name = args.class_name
-        project = ProjectAnalyzer(path)
+        project = _get_project(path, args.jobs)
         callers = project.get_callers(function_name, class_name)
         return {
             "path": path,
@@ -263,7 +298,7 @@ def cmd_callees(args: argparse.Namespace) -> dict:
         path = os.path.realpath(args.path)
         function_name = args.function
         class_name = args.class_name
-        project = ProjectAnalyzer(path)
+        project = _get_project(path, args.jobs)
         callees = project.get_callees(function_name, class_name)
         return {
             "path": path,
@@ -282,8 +317,8 @@ def cmd_symbols(args: argparse.Namespace) -> dict:
     try:
         path = os.path.realpath(args.path)
         name = args.name
-        project = ProjectAnalyzer(path)
-        refs = project.find_symbols(name)
+        project = _get_project(path, args.jobs)
+        refs = project.find_symbols(name, args.context)
         return {
             "path": path,
             "files_searched": len(project.files),
@@ -301,7 +336,7 @@ def cmd_definition(args: argparse.Namespace) -> dict:
         path = os.path.realpath(args.path)
         function_name = args.function
         class_name = args.class_name
-        project = ProjectAnalyzer(path)
+        project = _get_project(path, args.jobs)
         functions = project.get_all_functions_by_name(function_name, class_name)
         if not functions:
             return {"error": f"Function '{function_name}' not found"}
@@ -322,11 +357,10 @@ def cmd_function_variables(args: argparse.Namespace) -> dict:
         path = os.path.realpath(args.path)
         function_name = args.function
         class_name = args.class_name
-        project = ProjectAnalyzer(path)
-        functions = project.get_all_functions_by_name(function_name, class_name)
+        project = _get_project(path, args.jobs)
+        functions, variables = project.get_function_with_variables(function_name, class_name)
         if not functions:
             return {"error": f"Function '{function_name}' not found"}
-        variables = project.get_function_variables(function_name, class_name)
         return {
             "path": path,
             "files_searched": len(project.files),
@@ -345,11 +379,10 @@ def cmd_function_strings(args: argparse.Namespace) -> dict:
         path = os.path.realpath(args.path)
         function_name = args.function
         class_name = args.class_name
-        project = ProjectAnalyzer(path)
-        functions = project.get_all_functions_by_name(function_name, class_name)
+        project = _get_project(path, args.jobs)
+        functions, strings = project.get_function_with_strings(function_name, class_name)
         if not functions:
             return {"error": f"Function '{function_name}' not found"}
-        strings = project.get_function_strings(function_name, class_name)
         return {
             "path": path,
             "files_searched": len(project.files),
@@ -367,7 +400,7 @@ def cmd_super_classes(args: argparse.Namespace) -> dict:
     try:
         path = os.path.realpath(args.path)
         class_name = args.class_name
-        project = ProjectAnalyzer(path)
+        project = _get_project(path, args.jobs)
         super_classes = project.get_super_classes(class_name)
         return {
             "path": path,
@@ -385,7 +418,7 @@ def cmd_sub_classes(args: argparse.Namespace) -> dict:
     try:
         path = os.path.realpath(args.path)
         class_name = args.class_name
-        project = ProjectAnalyzer(path)
+        project = _get_project(path, args.jobs)
         sub_classes = project.get_sub_classes(class_name)
         return {
             "path": path,
@@ -398,6 +431,191 @@ def cmd_sub_classes(args: argparse.Namespace) -> dict:
         return {"error": str(e)}
 
 
+COMMANDS: dict[str, Callable[[argparse.Namespace], dict]] = {
+    "functions": cmd_functions,
+    "classes": cmd_classes,
+    "fields": cmd_fields,
+    "imports": cmd_imports,
+    "variables": cmd_variables,
+    "callers": cmd_callers,
+    "callees": cmd_callees,
+    "symbols": cmd_symbols,
+    "definition": cmd_definition,
+    "function-variables": cmd_function_variables,
+    "function-strings": cmd_function_strings,
+    "super-classes": cmd_super_classes,
+    "sub-classes": cmd_sub_classes,
+}
+
+_ArgSpec = tuple[tuple[str, ...], dict[str, Any]]
+
+_daemon_manifests: dict[str, dict[str, tuple[int, int]]] = {}
+
+
+def _handle_daemon_request(payload: dict) -> dict:
+    """Run a command received by the daemon against its resident analyzers."""
+    from tree_sitter_mcp.project import file_manifest
+
+    args = argparse.Namespace(**payload)
+    func = COMMANDS.get(args.command)
+    if func is None:
+        return {"error": f"Unknown command: {args.command}"}
+
+    # Parse in-process so analyzers stay resident for the next request.
+    args.jobs = 1
+    try:
+        manifest = file_manifest(args.path)
+    except OSError:
+        manifest = {}
+    if _daemon_manifests.get(args.path) != manifest:
+        _daemon_manifests[args.path] = manifest
+        _forget_project(args.path)
+    return func(args)
+
+
+def _run_via_daemon(args: argparse.Namespace) -> dict:
+    """Send a parsed command to a running daemon."""
+    from tree_sitter_analyzer.daemon import request
+
+    payload = {k: v for k, v in vars(args).items() if k not in ("func", "daemon", "cache_dir")}
+    payload["path"] = os.path.realpath(args.path)
+    try:
+        return request(args.daemon, payload)
+    except OSError as e:
+        return {"error": f"Cannot reach daemon at {args.daemon}: {e}"}
+
+
+_PATH_ARG: _ArgSpec = (("path",), {"help": "Directory path"})
+_CLASS_FILTER_ARG: _ArgSpec = (("-c", "--class-name"), {"help": "Class name to filter methods"})
+
+
+def _query_arg(what: str) -> _ArgSpec:
+    return (("-q", "--query"), {"help": f"Filter by {what} name (substring, or glob with * ? [])"})
+
+
+def _required_arg(flags: tuple[str, ...], help_text: str) -> _ArgSpec:
+    return (flags, {"required": True, "help": help_text})
+
+
+# Per-command help and arguments, shared by the full parser and the single-command fast path
+_COMMAND_ARGS: dict[str, tuple[str, list[_ArgSpec]]] = {
+    "functions": (
+        "Extract all function/method definitions",
+        [
+            _PATH_ARG,
+            _query_arg("function"),
+            (("--body",), {"action": "store_true", "help": "Include function body"}),
+        ],
+    ),
+    "classes": ("Extract all class/struct/interface definitions", [_PATH_ARG, _query_arg("class")]),
+    "fields": (
+        "Get all fields of a specific class",
+        [_PATH_ARG, _required_arg(("-c", "--class-name"), "Class name to get fields for")],
+    ),
+    "imports": ("Extract all import statements", [_PATH_ARG, _query_arg("module")]),
+    "variables": ("Extract all variable declarations", [_PATH_ARG, _query_arg("variable")]),
+    "callers": (
+        "Find functions that call a specific function",
+        [
+            _PATH_ARG,
+            _required_arg(("-f", "--function"), "Function name to find callers for"),
+            _CLASS_FILTER_ARG,
+        ],
+    ),
+    "callees": (
+        "Find functions called by a specific function",
+        [
+            _PATH_ARG,
+            _required_arg(("-f", "--function"), "Function name to find callees for"),
+            _CLASS_FILTER_ARG,
+        ],
+    ),
+    "symbols": (
+        "Find all references to a specific identifier",
+        [
+            _PATH_ARG,
+            _required_arg(("-n", "--name"), "Identifier name to search for"),
+            (
+                ("--no-context",),
+                {
+                    "action": "store_false",
+                    "dest": "context",
+                    "help": "Omit the source of each reference's enclosing node",
+                },
+            ),
+        ],
+    ),
+    "definition": (
+        "Get the complete source code of a function",
+        [
+            _PATH_ARG,
+            _required_arg(("-f", "--function"), "Function name to retrieve"),
+            _CLASS_FILTER_ARG,
+        ],
+    ),
+    "function-variables": (
+        "Get all variables declared in a function",
+        [
+            _PATH_ARG,
+            _required_arg(("-f", "--function"), "Function name to analyze"),
+            _CLASS_FILTER_ARG,
+        ],
+    ),
+    "function-strings": (
+        "Get all string literals in a function",
+        [
+            _PATH_ARG,
+            _required_arg(("-f", "--function"), "Function name to analyze"),
+            _CLASS_FILTER_ARG,
+        ],
+    ),
+    "super-classes": (
+        "Get all parent classes of a specific class",
+        [_PATH_ARG, _required_arg(("-c", "--class-name"), "Class name to find parents for")],
+    ),
+    "sub-classes": (
+        "Get all child classes that inherit from a class",
+        [_PATH_ARG, _required_arg(("-c", "--class-name"), "Class name to find children for")],
+    ),
+}
+
+
+def _add_command_args(p: argparse.ArgumentParser, name: str) -> None:
+    """Add a command's arguments and output options to a parser."""
+    for flags, kwargs in _COMMAND_ARGS[name][1]:
+        p.add_argument(*flags, **kwargs)
+    p.add_argument("--json", action="store_true", help="Output in JSON format")
+    p.add_argument("--yaml", action="store_true", help="Output in YAML format")
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for parsing large projects (default: 1, no pool)",
+    )
+    p.set_defaults(func=COMMANDS[name])
+
+
+@cache
+def _command_parser(name: str) -> argparse.ArgumentParser:
+    """Build a standalone parser for a single command."""
+    p = argparse.ArgumentParser(
+        prog=f"tree-sitter-analyzer {name}", description=_COMMAND_ARGS[name][0]
+    )
+    _add_command_args(p, name)
+    p.set_defaults(command=name, daemon=None, cache_dir=None)
+    return p
+
+
+def _parse_args(argv: list[str]) -> tuple[argparse.ArgumentParser, argparse.Namespace]:
+    """Parse arguments, building only the target command's parser when possible."""
+    if argv and argv[0] in COMMANDS and not {"-h", "--help"}.intersection(argv):
+        parser = _command_parser(argv[0])
+        return parser, parser.parse_args(argv[1:])
+    parser = create_parser()
+    return parser, parser.parse_args(argv)
+
+
 def create_parser() -> argparse.ArgumentParser:
     """Create the argument parser."""
     parser = argparse.ArgumentParser(
@@ -421,6 +639,13 @@ Examples:
   # Output as JSON
   tree-sitter-analyzer functions ./src/ --json
 
+  # Reuse extraction results across runs
+  tree-sitter-analyzer --cache-dir ~/.cache/tree-sitter-mcp functions ./src/
+
+  # Keep analyzers resident and query them through a daemon
+  tree-sitter-analyzer serve --socket /tmp/tsa.sock &
+  tree-sitter-analyzer --daemon /tmp/tsa.sock functions ./src/
+
 Supported languages: Python, JavaScript/TypeScript, Java, Go
 """,
     )
@@ -431,144 +656,57 @@ Supported languages: Python, JavaScript/TypeScript, Java, Go
         version="%(prog)s 0.1.0",
     )
 
-    subparsers = parser.add_subparsers(dest="command", help="Available commands")
-
-    def add_format_args(p: argparse.ArgumentParser) -> None:
-        p.add_argument("--json", action="store_true", help="Output in JSON format")
-        p.add_argument("--yaml", action="store_true", help="Output in YAML format")
-
-    # functions command
-    p_functions = subparsers.add_parser("functions", help="Extract all function/method definitions")
-    p_functions.add_argument("path", help="Directory path")
-    p_functions.add_argument("-q", "--query", help="Filter by function name (fuzzy match)")
-    p_functions.add_argument("--body", action="store_true", help="Include function body")
-    add_format_args(p_functions)
-    p_functions.set_defaults(func=cmd_functions)
-
-    # classes command
-    p_classes = subparsers.add_parser(
-        "classes", help="Extract all class/struct/interface definitions"
-    )
-    p_classes.add_argument("path", help="Directory path")
-    p_classes.add_argument("-q", "--query", help="Filter by class name (fuzzy match)")
-    add_format_args(p_classes)
-    p_classes.set_defaults(func=cmd_classes)
-
-    # fields command
-    p_fields = subparsers.add_parser("fields", help="Get all fields of a specific class")
-    p_fields.add_argument("path", help="Directory path")
-    p_fields.add_argument("-c", "--class-name", required=True, help="Class name to get fields for")
-    add_format_args(p_fields)
-    p_fields.set_defaults(func=cmd_fields)
-
-    # imports command
-    p_imports = subparsers.add_parser("imports", help="Extract all import statements")
-    p_imports.add_argument("path", help="Directory path")
-    p_imports.add_argument("-q", "--query", help="Filter by module name (fuzzy match)")
-    add_format_args(p_imports)
-    p_imports.set_defaults(func=cmd_imports)
-
-    # variables command
-    p_variables = subparsers.add_parser("variables", help="Extract all variable declarations")
-    p_variables.add_argument("path", help="Directory path")
-    p_variables.add_argument("-q", "--query", help="Filter by variable name (fuzzy match)")
-    add_format_args(p_variables)
-    p_variables.set_defaults(func=cmd_variables)
-
-    # callers command
-    p_callers = subparsers.add_parser(
-        "callers", help="Find functions that call a specific function"
-    )
-    p_callers.add_argument("path", help="Directory path")
-    p_callers.add_argument(
-        "-f", "--function", required=True, help="Function name to find callers for"
+    parser.add_argument(
+        "--daemon",
+        metavar="SOCKET",
+        help="Run the command through a daemon started with 'serve'",
     )
-    p_callers.add_argument("-c", "--class-name", help="Class name to filter methods")
-    add_format_args(p_callers)
-    p_callers.set_defaults(func=cmd_callers)
 
-    # callees command
-    p_callees = subparsers.add_parser(
-        "callees", help="Find functions called by a specific function"
-    )
-    p_callees.add_argument("path", help="Directory path")
-    p_callees.add_argument(
-        "-f", "--function", required=True, help="Function name to find callees for"
+    parser.add_argument(
+        "--cache-dir",
+        metavar="DIR",
+        help="Persist extraction results in DIR (overrides TREE_SITTER_MCP_CACHE_DIR)",
     )
-    p_callees.add_argument("-c", "--class-name", help="Class name to filter methods")
-    add_format_args(p_callees)
-    p_callees.set_defaults(func=cmd_callees)
 
-    # symbols command
-    p_symbols = subparsers.add_parser(
-        "symbols", help="Find all references to a specific identifier"
-    )
-    p_symbols.add_argument("path", help="Directory path")
-    p_symbols.add_argument("-n", "--name", required=True, help="Identifier name to search for")
-    add_format_args(p_symbols)
-    p_symbols.set_defaults(func=cmd_symbols)
-
-    # definition command
-    p_definition = subparsers.add_parser(
-        "definition", help="Get the complete source code of a function"
-    )
-    p_definition.add_argument("path", help="Directory path")
-    p_definition.add_argument("-f", "--function", required=True, help="Function name to retrieve")
-    p_definition.add_argument("-c", "--class-name", help="Class name to filter methods")
-    add_format_args(p_definition)
-    p_definition.set_defaults(func=cmd_definition)
-
-    # function-variables command
-    p_func_vars = subparsers.add_parser(
-        "function-variables", help="Get all variables declared in a function"
-    )
-    p_func_vars.add_argument("path", help="Directory path")
-    p_func_vars.add_argument("-f", "--function", required=True, help="Function name to analyze")
-    p_func_vars.add_argument("-c", "--class-name", help="Class name to filter methods")
-    add_format_args(p_func_vars)
-    p_func_vars.set_defaults(func=cmd_function_variables)
-
-    # function-strings command
-    p_func_strings = subparsers.add_parser(
-        "function-strings", help="Get all string literals in a function"
-    )
-    p_func_strings.add_argument("path", help="Directory path")
-    p_func_strings.add_argument("-f", "--function", required=True, help="Function name to analyze")
-    p_func_strings.add_argument("-c", "--class-name", help="Class name to filter methods")
-    add_format_args(p_func_strings)
-    p_func_strings.set_defaults(func=cmd_function_strings)
-
-    # super-classes command
-    p_super = subparsers.add_parser(
-        "super-classes", help="Get all parent classes of a specific class"
-    )
-    p_super.add_argument("path", help="Directory path")
-    p_super.add_argument("-c", "--class-name", required=True, help="Class name to find parents for")
-    add_format_args(p_super)
-    p_super.set_defaults(func=cmd_super_classes)
-
-    # sub-classes command
-    p_sub = subparsers.add_parser(
-        "sub-classes", help="Get all child classes that inherit from a class"
+    subparsers = parser.add_subparsers(dest="command", help="Available commands")
+
+    for name, (help_text, _) in _COMMAND_ARGS.items():
+        _add_command_args(subparsers.add_parser(name, help=help_text), name)
+
+    # serve command
+    p_serve = subparsers.add_parser(
+        "serve", help="Serve commands over a UNIX socket, keeping analyzers resident"
     )
-    p_sub.add_argument("path", help="Directory path")
-    p_sub.add_argument("-c", "--class-name", required=True, help="Class name to find children for")
-    add_format_args(p_sub)
-    p_sub.set_defaults(func=cmd_sub_classes)
+    p_serve.add_argument("--socket", required=True, help="UNIX socket path to listen on")
 
     return parser
 
 
 def main() -> int:
     """Main entry point for the CLI."""
-    parser = create_parser()
-    args = parser.parse_args()
+    parser, args = _parse_args(sys.argv[1:])
 
     if not args.command:
         parser.print_help()
         return 1
 
-    result = args.func(args)
+    if args.cache_dir:
+        from tree_sitter_mcp.cache import CACHE_DIR_ENV
+
+        # Through the environment so that worker processes pick it up too
+        os.environ[CACHE_DIR_ENV] = args.cache_dir
+
+    if args.command == "serve":
+        from tree_sitter_analyzer.daemon import serve
+
+        try:
+            serve(args.socket, _handle_daemon_request)
+        except (OSError, RuntimeError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
+
+    result = _run_via_daemon(args) if args.daemon else args.func(args)
     if args.json:
         output_format = "json"
     elif args.yaml:
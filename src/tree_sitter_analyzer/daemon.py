@@ -0,0 +1,66 @@
+"""Resident analyzer daemon serving CLI commands over a UNIX socket."""
+
+from __future__ import annotations
+
+import contextlib
+import json
+import os
+import socket
+import socketserver
+from collections.abc import Callable
+
+
+def _is_listening(socket_path: str) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def request(socket_path: str, payload: dict) -> dict:
+    """Send a command to a running daemon and return its result."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        with sock.makefile("rb") as f:
+            line = f.readline()
+    if not line:
+        return {"error": "Daemon closed the connection without a response"}
+    return json.loads(line)
+
+
+def serve(socket_path: str, handle: Callable[[dict], dict]) -> None:
+    """Serve newline-delimited JSON commands on a UNIX socket until interrupted."""
+    if os.path.exists(socket_path):
+        if _is_listening(socket_path):
+            raise RuntimeError(f"Daemon already running at {socket_path}")
+        os.unlink(socket_path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            line = self.rfile.readline()
+            if not line:
+                # Liveness probe from _is_listening(); nothing to answer.
+                return
+            try:
+                result = handle(json.loads(line))
+            except Exception as e:
+                result = {"error": str(e)}
+            with contextlib.suppress(BrokenPipeError):
+                self.wfile.write(json.dumps(result, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, Handler)
+    finally:
+        os.umask(old_umask)
+
+    with server:
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)
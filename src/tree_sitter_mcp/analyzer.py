@@ -2,13 +2,263 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import fnmatch
+import os
+import re
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field, replace
 from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
+from typing import Any, Generic, TypeVar
 
 import tree_sitter
 
-from .languages import detect_language, get_language, get_language_info, get_parser
+from .cache import AnalysisCache, source_digest
+from .languages import (
+    detect_language,
+    get_language,
+    get_language_info,
+    get_parser,
+    get_query_version,
+    get_supported_languages,
+)
+
+T = TypeVar("T")
+
+GLOB_CHARS = frozenset("*?[")
+
+# Node types that define functions, for finding the function enclosing a node
+FUNCTION_NODE_TYPES = frozenset(
+    {
+        "function_definition",
+        "async_function_definition",
+        "function_declaration",
+        "method_definition",
+        "arrow_function",
+        "method_declaration",
+        "constructor_declaration",
+        "function_expression",
+        "func_literal",
+    }
+)
+CLASS_NODE_TYPES = frozenset(
+    {"class_definition", "class_declaration", "class_body", "interface_declaration"}
+)
+METHOD_NODE_TYPES = frozenset(
+    {"function_definition", "method_definition", "method_declaration", "constructor_declaration"}
+)
+# Also includes Go interface method signatures
+CLASS_METHOD_NODE_TYPES = METHOD_NODE_TYPES | {"method_elem", "method_spec"}
+FIELD_NODE_TYPES = frozenset({"field_definition", "field_declaration"})
+NAME_IDENTIFIER_TYPES = frozenset({"identifier", "property_identifier", "field_identifier"})
+FIELD_TYPE_NODE_TYPES = frozenset(
+    {
+        "type_annotation",
+        "type",
+        "type_identifier",
+        "integral_type",
+        "floating_point_type",
+        "boolean_type",
+        "generic_type",
+        "array_type",
+        "scoped_type_identifier",
+    }
+)
+ATTRIBUTE_NODE_TYPES = frozenset({"attribute", "member_expression", "selector_expression"})
+JS_LIKE_LANGUAGES = frozenset({"javascript", "typescript", "tsx"})
+
+TREE_CACHE_SIZE = 1024
+# Coarsest mtime granularity allowed for (FAT's 2 s); a file read within this window of
+# its mtime may change again without changing its (mtime_ns, size) stamp
+RACY_WINDOW_NS = 2_000_000_000
+SYMBOL_INDEX_MAX_LEN = 128
+INTERN_MAX_LEN = 64
+# Query kinds extracted by CodeAnalyzer.analyze(), in result order
+ANALYZE_KINDS = ("function", "class", "call", "import", "variable", "string")
+
+# path -> ((mtime_ns, size), source, tree or None if not parsed yet, racy), in LRU order
+_tree_cache: OrderedDict[str, tuple[tuple[int, int], bytes, tree_sitter.Tree | None, bool]] = (
+    OrderedDict()
+)
+_tree_cache_lock = threading.Lock()
+
+
+def _is_racy(stamp: tuple[int, int]) -> bool:
+    """Whether a file read now is too close to its mtime for the stamp to vouch for it."""
+    return time.time_ns() - stamp[0] < RACY_WINDOW_NS
+
+
+def _recheck_source(path: str, stamp: tuple[int, int], source: bytes) -> bool | None:
+    """Compare a racily read source with the file.
+
+    Returns None if the contents differ, else whether the source is still racy.
+    """
+    still_racy = _is_racy(stamp)
+    try:
+        current = Path(path).read_bytes()
+    except OSError:
+        return None
+    if current != source:
+        return None
+    return still_racy
+
+
+def _get_cached_source(
+    path: str, stamp: tuple[int, int]
+) -> tuple[bytes, tree_sitter.Tree | None, bool] | None:
+    """Get the source (and tree, if parsed) of an unchanged file, and whether it is racy."""
+    with _tree_cache_lock:
+        entry = _tree_cache.get(path)
+        if entry is None or entry[0] != stamp:
+            return None
+        _tree_cache.move_to_end(path)
+    _, source, tree, racy = entry
+    if racy:
+        racy = _recheck_source(path, stamp, source)
+        if racy is None:
+            return None
+        if not racy:
+            with _tree_cache_lock:
+                if _tree_cache.get(path) is entry:
+                    _tree_cache[path] = (stamp, source, tree, False)
+    return source, tree, racy
+
+
+def _get_previous_parse(path: str) -> tuple[bytes, tree_sitter.Tree] | None:
+    """Get the last parsed source and tree of a file, whatever its stat stamp."""
+    with _tree_cache_lock:
+        entry = _tree_cache.get(path)
+    if entry is None or entry[2] is None:
+        return None
+    return entry[1], entry[2]
+
+
+def _store_cached_source(
+    path: str,
+    stamp: tuple[int, int],
+    source: bytes,
+    tree: tree_sitter.Tree | None,
+    racy: bool,
+) -> None:
+    with _tree_cache_lock:
+        _tree_cache[path] = (stamp, source, tree, racy)
+        _tree_cache.move_to_end(path)
+        while len(_tree_cache) > TREE_CACHE_SIZE:
+            _tree_cache.popitem(last=False)
+
+
+def _point_at(source: bytes, offset: int) -> tuple[int, int]:
+    head = source[:offset]
+    return head.count(b"\n"), offset - head.rfind(b"\n") - 1
+
+
+def _compute_edit(old: bytes, new: bytes) -> dict[str, Any]:
+    """Describe the span where two sources differ as Tree.edit() arguments."""
+    # Bisect on slice comparisons so the common prefix/suffix scans run in C
+    limit = min(len(old), len(new))
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[:mid] == new[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    start = lo
+    lo, hi = 0, limit - start
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[len(old) - mid :] == new[len(new) - mid :]:
+            lo = mid
+        else:
+            hi = mid - 1
+    old_end, new_end = len(old) - lo, len(new) - lo
+    return {
+        "start_byte": start,
+        "old_end_byte": old_end,
+        "new_end_byte": new_end,
+        "start_point": _point_at(old, start),
+        "old_end_point": _point_at(old, old_end),
+        "new_end_point": _point_at(new, new_end),
+    }
+
+
+def _reparse(
+    parser: tree_sitter.Parser,
+    old_source: bytes,
+    old_tree: tree_sitter.Tree,
+    new_source: bytes,
+    edit: dict[str, Any] | None = None,
+) -> tree_sitter.Tree:
+    """Parse new_source incrementally, reusing the unchanged subtrees of old_tree."""
+    # Trees are shared through the tree cache; edit a private copy
+    tree = old_tree.copy()
+    tree.edit(**(edit or _compute_edit(old_source, new_source)))
+    return parser.parse(new_source, tree)
+
+
+@lru_cache(maxsize=64)
+def compile_name_filter(query: str) -> Callable[[str], bool]:
+    """Compile a name filter: a substring match, or a glob if query contains * ? or [."""
+    if GLOB_CHARS.isdisjoint(query):
+        return lambda name: query in name
+    return re.compile(fnmatch.translate(query)).match
+
+
+@lru_cache(maxsize=64)
+def _get_fused_query(language: str, kinds: tuple[str, ...]) -> tree_sitter.Query | None:
+    """Combine several of a language's queries into one, prefixing captures with their kind."""
+    lang_info = get_language_info(language)
+    if not lang_info:
+        return None
+    patterns = [
+        re.sub(r"@(\w+)", rf"@{kind}.\1", getattr(lang_info, f"{kind}_query")) for kind in kinds
+    ]
+    return _get_compiled_query(language, "\n".join(patterns))
+
+
+def warm_up(languages: Iterable[str] | None = None) -> None:
+    """Load grammars and compile their queries ahead of the first request."""
+    for language in get_supported_languages() if languages is None else languages:
+        lang_info = get_language_info(language)
+        if not lang_info:
+            continue
+        for kind in ANALYZE_KINDS:
+            _get_compiled_query(language, getattr(lang_info, f"{kind}_query"))
+        _get_fused_query(language, ANALYZE_KINDS)
+
+
+def _document_order(node: tree_sitter.Node) -> tuple[int, int]:
+    """Sort key putting nodes in source order, enclosing nodes before nested ones."""
+    return node.start_byte, -node.end_byte
+
+
+def _sort_captures(captures: dict[str, list[tree_sitter.Node]]) -> None:
+    # QueryCursor.captures() doesn't return nodes in a stable order
+    for nodes in captures.values():
+        nodes.sort(key=_document_order)
+
+
+def _match_names(
+    containers: list[tree_sitter.Node], name_nodes: list[tree_sitter.Node]
+) -> Iterator[tuple[tree_sitter.Node, tree_sitter.Node | None]]:
+    """Pair each container node with the first captured name node inside it."""
+    names = sorted(name_nodes, key=attrgetter("start_byte"))
+    starts = [n.start_byte for n in names]
+    for container in containers:
+        match = None
+        i = bisect_left(starts, container.start_byte)
+        while i < len(names) and starts[i] < container.end_byte:
+            if names[i].end_byte <= container.end_byte:
+                match = names[i]
+                break
+            i += 1
+        yield container, match
 
 
 @lru_cache(maxsize=128)
@@ -23,7 +273,7 @@ def _get_compiled_query(language: str, query_str: str) -> tree_sitter.Query | No
         return None
 
 
-@dataclass
+@dataclass(slots=True)
 class Location:
     file: str
     start_line: int
@@ -37,15 +287,32 @@ class Location:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class FunctionInfo:
     name: str
     location: Location
     parameters: str = ""
-    body: str = ""
     is_method: bool = False
     class_name: str | None = None
     node: tree_sitter.Node | None = None
+    # Source of the file, so the body is only decoded when it is asked for
+    source: bytes | None = field(default=None, repr=False, compare=False)
+    _body: str | None = field(default=None, repr=False, compare=False)
+
+    @property
+    def body(self) -> str:
+        if self._body is None:
+            if self.node is not None and self.source is not None:
+                self._body = self.source[self.node.start_byte : self.node.end_byte].decode(
+                    "utf-8", errors="replace"
+                )
+            else:
+                self._body = ""
+        return self._body
+
+    def detach(self) -> FunctionInfo:
+        """Copy without tree or source references, with the body materialized."""
+        return replace(self, node=None, source=None, _body=self.body)
 
     def to_dict(self, include_body: bool = True, include_file: bool = True) -> dict:
         result = {
@@ -64,7 +331,7 @@ class FunctionInfo:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassInfo:
     name: str
     location: Location
@@ -85,7 +352,7 @@ class ClassInfo:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class CallInfo:
     callee: str
     location: Location
@@ -109,7 +376,7 @@ class CallInfo:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class VariableInfo:
     name: str
     location: Location
@@ -126,7 +393,7 @@ class VariableInfo:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportInfo:
     module: str
     location: Location
@@ -141,7 +408,7 @@ class ImportInfo:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class StringLiteral:
     value: str
     location: Location
@@ -156,7 +423,7 @@ class StringLiteral:
         return result
 
 
-@dataclass
+@dataclass(slots=True)
 class FieldInfo:
     name: str
     location: Location
@@ -177,29 +444,100 @@ class FieldInfo:
         return result
 
 
+# Query kind -> (persistent cache kind, CodeAnalyzer attribute holding the results)
+_RESULT_ATTRS = {
+    "function": ("functions", "_functions_cache"),
+    "class": ("classes", "_classes_cache"),
+    "call": ("calls", "_calls_cache"),
+    "import": ("imports", "_imports_cache"),
+    "variable": ("variables", "_variables_cache"),
+    "string": ("strings", "_strings_cache"),
+}
+
+
+class _LineIndex(Generic[T]):
+    """Items sorted by start line, for slicing out those within a line range."""
+
+    def __init__(self, items: list[T]):
+        self.items = sorted(items, key=lambda item: item.location.start_line)
+        self.lines = [item.location.start_line for item in self.items]
+
+    def between(self, start_line: int, end_line: int) -> list[T]:
+        lo = bisect_left(self.lines, start_line)
+        hi = bisect_right(self.lines, end_line)
+        return self.items[lo:hi]
+
+
 class CodeAnalyzer:
     """Analyzes source code using tree-sitter."""
 
-    def __init__(self, file_path: str | None = None, language: str | None = None):
+    def __init__(
+        self,
+        file_path: str | None = None,
+        language: str | None = None,
+        cache: AnalysisCache | None = None,
+    ):
         self.file_path = file_path
         self._language = language
+        self._cache = cache
         self._source: bytes | None = None
+        self._stamp: tuple[int, int] | None = None
+        # Whether the source was read too soon after the file's mtime for the stamp alone
+        # to show that the file is unchanged
+        self._racy = False
         self._tree: tree_sitter.Tree | None = None
         self._parser: tree_sitter.Parser | None = None
-        self._functions_cache: list[FunctionInfo] | None = None
-        self._calls_cache: list[CallInfo] | None = None
-        self._classes_cache: list[ClassInfo] | None = None
+        # Source and tree of an earlier version of the file, reused by the next parse
+        self._previous_parse: tuple[bytes, tree_sitter.Tree] | None = None
+        self._invalidate_caches()
 
         if file_path:
             self._load_file(file_path)
 
+    def _invalidate_caches(self) -> None:
+        """Drop every result memoized from the current tree.
+
+        Call this whenever the source or tree is replaced so that the per-tree
+        query captures, extracted results and lookup indexes are rebuilt.
+        """
+        self._source_digest: bytes | None = None
+        self._enclosing_function_memo: dict[int, str | None] = {}
+        self._enclosing_class_memo: dict[int, str | None] = {}
+        self._captures: dict[str, dict[str, list[tree_sitter.Node]]] = {}
+        self._call_indexes: dict[str, dict[str | None, list[CallInfo]]] = {}
+        self._functions_cache: list[FunctionInfo] | None = None
+        self._calls_cache: list[CallInfo] | None = None
+        self._classes_cache: list[ClassInfo] | None = None
+        self._imports_cache: list[ImportInfo] | None = None
+        self._variables_cache: list[VariableInfo] | None = None
+        self._strings_cache: list[StringLiteral] | None = None
+        self._functions_by_name: dict[str, list[FunctionInfo]] | None = None
+        self._classes_by_name: dict[str, list[ClassInfo]] | None = None
+        self._variables_by_line: _LineIndex[VariableInfo] | None = None
+        self._strings_by_line: _LineIndex[StringLiteral] | None = None
+        self._symbol_index: dict[bytes, list[tree_sitter.Node]] | None = None
+        self._symbol_lookups = 0
+
     def _load_file(self, file_path: str) -> None:
         """Load file content and detect language (lazy parsing)."""
-        path = Path(file_path)
-        if not path.exists():
-            raise FileNotFoundError(f"File not found: {file_path}")
-
-        self._source = path.read_bytes()
+        try:
+            st = os.stat(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found: {file_path}") from None
+
+        self._invalidate_caches()
+        self._tree = None
+
+        # Reuse the source and tree of an unchanged file analyzed earlier in this process
+        self._stamp = (st.st_mtime_ns, st.st_size)
+        cached = _get_cached_source(file_path, self._stamp)
+        if cached is not None:
+            self._source, self._tree, self._racy = cached
+        else:
+            self._racy = _is_racy(self._stamp)
+            self._source = Path(file_path).read_bytes()
+            self._previous_parse = _get_previous_parse(file_path)
+            _store_cached_source(file_path, self._stamp, self._source, None, self._racy)
         if not self._language:
             self._language = detect_language(file_path)
 
@@ -216,7 +554,66 @@ class CodeAnalyzer:
             return
         if self._parser is None or self._source is None:
             return
-        self._tree = self._parser.parse(self._source)
+        if self._previous_parse is not None:
+            old_source, old_tree = self._previous_parse
+            self._previous_parse = None
+            self._tree = _reparse(self._parser, old_source, old_tree, self._source)
+        else:
+            self._tree = self._parser.parse(self._source)
+        if self.file_path is not None and self._stamp is not None:
+            _store_cached_source(self.file_path, self._stamp, self._source, self._tree, self._racy)
+
+    def is_stale(self) -> bool:
+        """Whether the file changed on disk, or was edited in memory, since it was loaded."""
+        if self.file_path is None:
+            return False
+        try:
+            st = os.stat(self.file_path)
+        except OSError:
+            return True
+        if self._stamp != (st.st_mtime_ns, st.st_size):
+            return True
+        if self._racy and self._source is not None:
+            racy = _recheck_source(self.file_path, self._stamp, self._source)
+            if racy is None:
+                return True
+            self._racy = racy
+        return False
+
+    def apply_edit(self, new_source: bytes, edit: dict[str, Any] | None = None) -> None:
+        """Replace the source, reparsing incrementally from the current tree.
+
+        Args:
+            new_source: The edited source code
+            edit: Tree.edit() arguments describing the change; derived from the
+                differing span of the old and new source when omitted
+        """
+        self._ensure_tree()
+        old_source, old_tree = self._source, self._tree
+        self._invalidate_caches()
+        # The source no longer matches the file on disk, so bypass the stamp-keyed caches
+        self._stamp = None
+        self._source = new_source
+        if old_source is None or old_tree is None or self._parser is None:
+            self._tree = None
+            return
+        self._tree = _reparse(self._parser, old_source, old_tree, new_source, edit)
+
+    def _digest(self) -> bytes:
+        if self._source_digest is None:
+            self._source_digest = source_digest(self._source or b"")
+        return self._source_digest
+
+    def _cached(self, kind: str, extract: Callable[[], list[T]]) -> list[T]:
+        """Run an extractor, going through the persistent cache when one is configured."""
+        if self._cache is None or self.file_path is None or self._stamp is None:
+            return extract()
+        version = get_query_version(self._language or "")
+        items = self._cache.get(self.file_path, kind, version, self._stamp, self._digest)
+        if items is None:
+            items = extract()
+            self._cache.put(self.file_path, kind, version, self._stamp, self._digest(), items)
+        return items
 
     def _node_location(self, node: tree_sitter.Node) -> Location:
         return Location(
@@ -228,52 +625,126 @@ class CodeAnalyzer:
     def _node_text(self, node: tree_sitter.Node) -> str:
         if self._source is None:
             return ""
-        return self._source[node.start_byte : node.end_byte].decode("utf-8", errors="replace")
+        start, end = node.start_byte, node.end_byte
+        text = self._source[start:end].decode("utf-8", errors="replace")
+        # Identifiers repeat across calls, variables and fields; share one string
+        # object per name so results stay small in memory and when pickled.
+        return sys.intern(text) if end - start <= INTERN_MAX_LEN else text
+
+    def _node_bytes(self, node: tree_sitter.Node) -> bytes:
+        """Raw source of a node, for comparisons that don't need decoded text."""
+        if self._source is None:
+            return b""
+        return self._source[node.start_byte : node.end_byte]
+
+    def _run_query(self, kind: str) -> dict[str, list[tree_sitter.Node]]:
+        """Get the captures of one of the language's queries, e.g. kind="function"."""
+        captures = self._captures.get(kind)
+        if captures is not None:
+            return captures
 
-    def _run_query(self, query_str: str) -> dict[str, list[tree_sitter.Node]]:
         self._ensure_tree()
         if not self._tree or not self._language:
             return {}
+        lang_info = get_language_info(self._language)
+        if not lang_info:
+            return {}
 
-        query = _get_compiled_query(self._language, query_str)
+        query = _get_compiled_query(self._language, getattr(lang_info, f"{kind}_query"))
         if not query:
             return {}
 
         try:
             cursor = tree_sitter.QueryCursor(query)
-            return cursor.captures(self._tree.root_node)
+            captures = cursor.captures(self._tree.root_node)
         except Exception:
             return {}
+        _sort_captures(captures)
+        self._captures[kind] = captures
+        return captures
+
+    def prefetch(self, *kinds: str) -> None:
+        """Run the queries for several kinds in a single pass over the tree.
+
+        Kinds whose results are already available, in memory or in the persistent
+        cache, are skipped; with fewer than two left, the individual queries are
+        cheaper and this does nothing.
+        """
+        if not self._language:
+            return
+        if self._cache is not None:
+            self._load_cached_results(kinds)
+        pending = tuple(
+            k
+            for k in kinds
+            if k not in self._captures
+            and not (k in _RESULT_ATTRS and getattr(self, _RESULT_ATTRS[k][1]) is not None)
+        )
+        if len(pending) < 2:
+            return
+
+        self._ensure_tree()
+        query = _get_fused_query(self._language, pending)
+        if not self._tree or not query:
+            return
+        try:
+            fused = tree_sitter.QueryCursor(query).captures(self._tree.root_node)
+        except Exception:
+            return
+        _sort_captures(fused)
+        # Filled in locally: analyzers are shared across threads, and another caller
+        # must never see a kind's captures before all of them are in
+        captures: dict[str, dict[str, list[tree_sitter.Node]]] = {kind: {} for kind in pending}
+        for name, nodes in fused.items():
+            kind, _, capture = name.partition(".")
+            captures[kind][capture] = nodes
+        self._captures.update(captures)
+
+    def _load_cached_results(self, kinds: tuple[str, ...]) -> None:
+        """Fill in the results of kinds that the persistent cache already holds."""
+        if self._cache is None or self.file_path is None or self._stamp is None:
+            return
+        version = get_query_version(self._language or "")
+        for kind in kinds:
+            if kind not in _RESULT_ATTRS:
+                continue
+            cache_kind, attr = _RESULT_ATTRS[kind]
+            if getattr(self, attr) is None:
+                items = self._cache.get(
+                    self.file_path, cache_kind, version, self._stamp, self._digest
+                )
+                if items is not None:
+                    setattr(self, attr, items)
 
     def _find_enclosing_function(self, node: tree_sitter.Node) -> str | None:
+        # Node.parent re-descends from the root, so remember the answer for every
+        # ancestor visited; sibling calls and variables then stop after one hop.
+        memo = self._enclosing_function_memo
+        visited = []
+        result = None
         current = node.parent
-        func_types = {
-            "function_definition",
-            "async_function_definition",
-            "function_declaration",
-            "method_definition",
-            "arrow_function",
-            "method_declaration",
-            "constructor_declaration",
-            "function_expression",
-            "func_literal",
-        }
-        anonymous_types = {"arrow_function", "func_literal"}
         while current:
-            if current.type in func_types:
-                name_node = current.child_by_field_name("name")
-                if name_node:
-                    return self._node_text(name_node)
-                if current.type in anonymous_types:
-                    inferred = self._infer_anonymous_function_name(current)
-                    return inferred
-                if current.type == "function_expression":
-                    inferred = self._infer_anonymous_function_name(current)
-                    return inferred
-                for child in current.children:
-                    if child.type in ("identifier", "property_identifier", "field_identifier"):
-                        return self._node_text(child)
+            if current.id in memo:
+                result = memo[current.id]
+                break
+            visited.append(current.id)
+            if current.type in FUNCTION_NODE_TYPES:
+                result = self._function_node_name(current)
+                break
             current = current.parent
+        for node_id in visited:
+            memo[node_id] = result
+        return result
+
+    def _function_node_name(self, func_node: tree_sitter.Node) -> str | None:
+        name_node = func_node.child_by_field_name("name")
+        if name_node:
+            return self._node_text(name_node)
+        if func_node.type in ("arrow_function", "func_literal", "function_expression"):
+            return self._infer_anonymous_function_name(func_node)
+        for child in func_node.children:
+            if child.type in NAME_IDENTIFIER_TYPES:
+                return self._node_text(child)
         return None
 
     def _infer_anonymous_function_name(self, func_node: tree_sitter.Node) -> str | None:
@@ -302,24 +773,37 @@ class CodeAnalyzer:
 
     def _find_enclosing_class(self, node: tree_sitter.Node) -> str | None:
         """Find the name of the class that encloses this node."""
-        class_types = {
-            "class_definition",
-            "class_declaration",
-            "class_body",
-            "interface_declaration",
-        }
+        # Memoized per ancestor like _find_enclosing_function
+        memo = self._enclosing_class_memo
+        visited = []
+        result = None
         current = node.parent
         while current:
+            if current.id in memo:
+                result = memo[current.id]
+                break
+            visited.append(current.id)
             if current.type == "method_declaration":
                 receiver_class = self._extract_go_receiver_type(current)
                 if receiver_class:
-                    return receiver_class
-            if current.type in class_types:
-                for child in current.children:
-                    if child.type in ("identifier", "type_identifier", "name"):
-                        return self._node_text(child)
+                    result = receiver_class
+                    break
+            if current.type in CLASS_NODE_TYPES:
+                name_node = next(
+                    (
+                        child
+                        for child in current.children
+                        if child.type in ("identifier", "type_identifier", "name")
+                    ),
+                    None,
+                )
+                if name_node is not None:
+                    result = self._node_text(name_node)
+                    break
             current = current.parent
-        return None
+        for node_id in visited:
+            memo[node_id] = result
+        return result
 
     def _extract_go_receiver_type(self, method_node: tree_sitter.Node) -> str | None:
         """Extract receiver type from a Go method_declaration node."""
@@ -371,13 +855,11 @@ class CodeAnalyzer:
             if operand_node:
                 obj_name = self._node_text(operand_node)
         else:
-            id_types = ("identifier", "property_identifier", "field_identifier")
-            attr_types = ("attribute", "member_expression", "selector_expression")
             ids = []
             for child in node.children:
-                if child.type in id_types:
+                if child.type in NAME_IDENTIFIER_TYPES:
                     ids.append(self._node_text(child))
-                elif child.type in attr_types:
+                elif child.type in ATTRIBUTE_NODE_TYPES:
                     obj_name = self._node_text(child)
             if ids:
                 callee = ids[-1]
@@ -386,10 +868,16 @@ class CodeAnalyzer:
 
         return callee, obj_name
 
-    def get_functions(self) -> list[FunctionInfo]:
-        if self._functions_cache is not None:
-            return self._functions_cache
+    def get_functions(self, query: str = "") -> list[FunctionInfo]:
+        """Get all functions, optionally only those whose name contains query."""
+        if self._functions_cache is None:
+            self._functions_cache = self._cached("functions", self._extract_functions)
+        if query:
+            matches = compile_name_filter(query)
+            return [f for f in self._functions_cache if matches(f.name)]
+        return self._functions_cache
 
+    def _extract_functions(self) -> list[FunctionInfo]:
         if not self._language:
             return []
 
@@ -397,40 +885,32 @@ class CodeAnalyzer:
         if not lang_info:
             return []
 
-        captures = self._run_query(lang_info.function_query)
+        captures = self._run_query("function")
         func_nodes = captures.get("function", [])
         name_nodes = captures.get("name", [])
 
         functions = []
-        for func_node in func_nodes:
-            name = ""
-            for name_node in name_nodes:
-                if (
-                    func_node.start_byte <= name_node.start_byte
-                    and name_node.end_byte <= func_node.end_byte
-                ):
-                    name = self._node_text(name_node)
-                    break
+        for func_node, name_node in _match_names(func_nodes, name_nodes):
+            name = self._node_text(name_node) if name_node else ""
             if name:
                 class_name = self._find_enclosing_class(func_node)
                 functions.append(
                     FunctionInfo(
                         name=name,
                         location=self._node_location(func_node),
-                        body=self._node_text(func_node),
                         node=func_node,
+                        source=self._source,
                         is_method=class_name is not None,
                         class_name=class_name,
                     )
                 )
 
-        self._functions_cache = functions
         return functions
 
     def get_function_by_name(self, name: str, class_name: str | None = None) -> FunctionInfo | None:
         """Get a specific function by name, optionally filtering by class_name."""
-        for func in self.get_functions():
-            if func.name == name and (class_name is None or func.class_name == class_name):
+        for func in self._functions_named(name):
+            if class_name is None or func.class_name == class_name:
                 return func
         return None
 
@@ -438,41 +918,57 @@ class CodeAnalyzer:
         self, name: str, class_name: str | None = None
     ) -> list[FunctionInfo]:
         """Get all functions with a given name, optionally filtering by class_name."""
-        results = []
-        for func in self.get_functions():
-            if func.name == name and (class_name is None or func.class_name == class_name):
-                results.append(func)
-        return results
+        return [
+            func
+            for func in self._functions_named(name)
+            if class_name is None or func.class_name == class_name
+        ]
+
+    def _functions_named(self, name: str) -> list[FunctionInfo]:
+        if self._functions_by_name is None:
+            self._functions_by_name = {}
+            for func in self.get_functions():
+                self._functions_by_name.setdefault(func.name, []).append(func)
+        return self._functions_by_name.get(name, [])
 
     def get_function_variables(
         self, function_name: str, class_name: str | None = None
     ) -> list[VariableInfo]:
         """Get all variables declared within a specific function."""
-        funcs = self.get_all_functions_by_name(function_name, class_name)
-        all_vars = self.get_variables()
+        self.prefetch("function", "variable")
+        return self.get_variables_in(self.get_all_functions_by_name(function_name, class_name))
+
+    def get_function_strings(
+        self, function_name: str, class_name: str | None = None
+    ) -> list[StringLiteral]:
+        """Get all string literals within a specific function."""
+        self.prefetch("function", "string")
+        return self.get_strings_in(self.get_all_functions_by_name(function_name, class_name))
+
+    def get_variables_in(self, funcs: list[FunctionInfo]) -> list[VariableInfo]:
+        """Get all variables declared within already-resolved functions."""
+        if not funcs:
+            return []
+        if self._variables_by_line is None:
+            self._variables_by_line = _LineIndex(self.get_variables())
         results = []
         for func in funcs:
             results.extend(
-                v
-                for v in all_vars
-                if func.location.start_line <= v.location.start_line <= func.location.end_line
+                self._variables_by_line.between(func.location.start_line, func.location.end_line)
             )
         return results
 
-    def get_function_strings(
-        self, function_name: str, class_name: str | None = None
-    ) -> list[StringLiteral]:
-        """Get all string literals within a specific function."""
-        funcs = self.get_all_functions_by_name(function_name, class_name)
-        all_strings = self.get_strings()
+    def get_strings_in(self, funcs: list[FunctionInfo]) -> list[StringLiteral]:
+        """Get all string literals within already-resolved functions."""
+        if not funcs:
+            return []
+        if self._strings_by_line is None:
+            self._strings_by_line = _LineIndex(self.get_strings())
         results = []
         for func in funcs:
-            if func.node:
-                results.extend(
-                    s
-                    for s in all_strings
-                    if func.location.start_line <= s.location.start_line <= func.location.end_line
-                )
+            results.extend(
+                self._strings_by_line.between(func.location.start_line, func.location.end_line)
+            )
         return results
 
     def get_function_body(self, function_name: str) -> str | None:
@@ -482,21 +978,24 @@ class CodeAnalyzer:
             return func.body
         return None
 
-    def get_function_callees(self, function_name: str, class_name: str | None = None) -> list[dict]:
+    def get_function_callees(
+        self, function_name: str, class_name: str | None = None, named_only: bool = False
+    ) -> list[dict]:
         """Get all functions/methods called by a specific function.
 
         Works for both named functions (from get_functions()) and inferred names
-        from anonymous functions like arrow functions.
+        from anonymous functions like arrow functions, unless named_only is set.
         """
+        self.prefetch("function", "call")
         funcs = self.get_all_functions_by_name(function_name, class_name)
-        all_calls = self.get_calls()
+        calls_by_caller = self._calls_grouped_by("caller")
         callees: list[dict] = []
         seen: set[tuple[str, str | None]] = set()
 
         if funcs:
             for func in funcs:
-                for call in all_calls:
-                    if call.caller == func.name and call.caller_class_name == func.class_name:
+                for call in calls_by_caller.get(func.name, ()):
+                    if call.caller_class_name == func.class_name:
                         callee = call.callee
                         if call.object_name:
                             callee = f"{call.object_name}.{callee}"
@@ -510,37 +1009,55 @@ class CodeAnalyzer:
                                     "class_name": func.class_name,
                                 }
                             )
-        else:
-            for call in all_calls:
-                if call.caller == function_name:
-                    if class_name is not None and call.caller_class_name != class_name:
-                        continue
-                    callee = call.callee
-                    if call.object_name:
-                        callee = f"{call.object_name}.{callee}"
-                    key = (callee, call.caller_class_name)
-                    if key not in seen:
-                        seen.add(key)
-                        callees.append(
-                            {
-                                "callee": callee,
-                                "line": call.location.start_line,
-                                "class_name": call.caller_class_name,
-                            }
-                        )
+        elif not named_only:
+            for call in calls_by_caller.get(function_name, ()):
+                if class_name is not None and call.caller_class_name != class_name:
+                    continue
+                callee = call.callee
+                if call.object_name:
+                    callee = f"{call.object_name}.{callee}"
+                key = (callee, call.caller_class_name)
+                if key not in seen:
+                    seen.add(key)
+                    callees.append(
+                        {
+                            "callee": callee,
+                            "line": call.location.start_line,
+                            "class_name": call.caller_class_name,
+                        }
+                    )
         return callees
 
+    def analyze(self) -> dict[str, list[Any]]:
+        """Extract every view of the file, running all queries in one tree pass."""
+        self.prefetch(*ANALYZE_KINDS)
+        return {
+            "functions": self.get_functions(),
+            "classes": self.get_classes(),
+            "calls": self.get_calls(),
+            "imports": self.get_imports(),
+            "variables": self.get_variables(),
+            "strings": self.get_strings(),
+        }
+
+    def _calls_grouped_by(self, attr: str) -> dict[str | None, list[CallInfo]]:
+        """Index calls by "caller" or "callee", keeping call order within each group."""
+        index = self._call_indexes.get(attr)
+        if index is None:
+            index = {}
+            for call in self.get_calls():
+                index.setdefault(getattr(call, attr), []).append(call)
+            self._call_indexes[attr] = index
+        return index
+
     def get_function_callers(self, function_name: str, class_name: str | None = None) -> list[dict]:
         """Get all functions that call a specific function.
 
         Note: class_name is used to filter calls by the object name (e.g., self.method()).
         """
-        all_calls = self.get_calls()
         callers: list[dict] = []
         seen: set[tuple[str, int]] = set()
-        for call in all_calls:
-            if call.callee != function_name:
-                continue
+        for call in self._calls_grouped_by("callee").get(function_name, ()):
             if class_name is not None:
                 matches_explicit_target = call.object_name == class_name
                 matches_implicit_same_class = (
@@ -572,10 +1089,16 @@ class CodeAnalyzer:
                 )
         return callers
 
-    def get_classes(self) -> list[ClassInfo]:
-        if self._classes_cache is not None:
-            return self._classes_cache
+    def get_classes(self, query: str = "") -> list[ClassInfo]:
+        """Get all classes, optionally only those whose name contains query."""
+        if self._classes_cache is None:
+            self._classes_cache = self._cached("classes", self._extract_classes)
+        if query:
+            matches = compile_name_filter(query)
+            return [c for c in self._classes_cache if matches(c.name)]
+        return self._classes_cache
 
+    def _extract_classes(self) -> list[ClassInfo]:
         if not self._language:
             return []
 
@@ -585,24 +1108,18 @@ class CodeAnalyzer:
 
         methods_by_class: dict[str, set[str]] = {}
         if self._language == "go":
+            self.prefetch("function", "class")
             for func in self.get_functions():
                 if func.class_name:
                     methods_by_class.setdefault(func.class_name, set()).add(func.name)
 
-        captures = self._run_query(lang_info.class_query)
+        captures = self._run_query("class")
         class_nodes = captures.get("class", [])
         name_nodes = captures.get("name", [])
 
         classes = []
-        for class_node in class_nodes:
-            name = ""
-            for name_node in name_nodes:
-                if (
-                    class_node.start_byte <= name_node.start_byte
-                    and name_node.end_byte <= class_node.end_byte
-                ):
-                    name = self._node_text(name_node)
-                    break
+        for class_node, name_node in _match_names(class_nodes, name_nodes):
+            name = self._node_text(name_node) if name_node else ""
             if name:
                 methods = self._extract_methods_from_class(class_node)
                 if self._language == "go":
@@ -619,36 +1136,28 @@ class CodeAnalyzer:
                     )
                 )
 
-        self._classes_cache = classes
         return classes
 
     def _extract_methods_from_class(self, class_node: tree_sitter.Node) -> list[str]:
         """Extract method names from a class node."""
         methods = []
-        method_types = {
-            "function_definition",
-            "method_definition",
-            "method_declaration",
-            "constructor_declaration",
-            "method_elem",
-            "method_spec",
-        }
-
-        def walk(node: tree_sitter.Node):
-            if node.type in method_types:
+        # Preorder walk scoped to class_node that does not descend into method bodies
+        cursor = class_node.walk()
+        while True:
+            node = cursor.node
+            if node.type in CLASS_METHOD_NODE_TYPES:
                 for child in node.children:
-                    if child.type in ("identifier", "property_identifier", "field_identifier"):
+                    if child.type in NAME_IDENTIFIER_TYPES:
                         methods.append(self._node_text(child))
                         break
                     if child.type == "name":
                         methods.append(self._node_text(child))
                         break
-                return
-            for child in node.children:
-                walk(child)
-
-        walk(class_node)
-        return methods
+            elif cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return methods
 
     def _get_class_body_node(self, class_node: tree_sitter.Node) -> tree_sitter.Node | None:
         body = class_node.child_by_field_name("body")
@@ -720,7 +1229,7 @@ class CodeAnalyzer:
 
             if member.type == "method_definition":
                 name_node = member.child_by_field_name("name")
-                if name_node is None or self._node_text(name_node) != "constructor":
+                if name_node is None or self._node_bytes(name_node) != b"constructor":
                     continue
 
                 params = member.child_by_field_name("parameters")
@@ -759,39 +1268,23 @@ class CodeAnalyzer:
 
     def _extract_fields_from_class(self, class_node: tree_sitter.Node) -> list[str]:
         """Extract field names from a class node."""
-        if self._language in {"javascript", "typescript", "tsx"}:
+        if self._language in JS_LIKE_LANGUAGES:
             class_name_node = class_node.child_by_field_name("name")
             class_name = self._node_text(class_name_node) if class_name_node else ""
             return [f.name for f in self._extract_field_infos_js_like(class_node, class_name)]
 
         fields: list[str] = []
         seen: set[str] = set()
-        field_types = {
-            "field_definition",
-            "field_declaration",
-        }
-        method_types = {
-            "function_definition",
-            "method_definition",
-            "method_declaration",
-            "constructor_declaration",
-        }
 
         def add_field(name: str) -> None:
             if name and name not in seen:
                 seen.add(name)
                 fields.append(name)
 
-        def walk(node: tree_sitter.Node, inside_method: bool = False):
-            if node.type in method_types:
-                if self._language != "python":
-                    return
+        for node in self._iter_field_nodes(class_node):
+            if node.type in FIELD_NODE_TYPES:
                 for child in node.children:
-                    walk(child, inside_method=True)
-                return
-            if node.type in field_types:
-                for child in node.children:
-                    if child.type in ("identifier", "property_identifier", "field_identifier"):
+                    if child.type in NAME_IDENTIFIER_TYPES:
                         add_field(self._node_text(child))
                         break
                     if child.type == "variable_declarator":
@@ -800,40 +1293,69 @@ class CodeAnalyzer:
                                 add_field(self._node_text(sub))
                                 break
                         break
-                return
-            if self._language == "python" and node.type == "expression_statement" and inside_method:
-                for child in node.children:
-                    if child.type == "assignment":
-                        left_node = child.child_by_field_name("left")
-                        if left_node is not None and left_node.type == "attribute":
-                            obj_node = left_node.child_by_field_name("object")
-                            attr_node = left_node.child_by_field_name("attribute")
-                            if (
-                                obj_node is not None
-                                and attr_node is not None
-                                and self._node_text(obj_node) == "self"
-                            ):
-                                add_field(self._node_text(attr_node))
-                        break
-                return
+                continue
             for child in node.children:
-                walk(child, inside_method)
+                if child.type == "assignment":
+                    left_node = child.child_by_field_name("left")
+                    if left_node is not None and left_node.type == "attribute":
+                        obj_node = left_node.child_by_field_name("object")
+                        attr_node = left_node.child_by_field_name("attribute")
+                        if (
+                            obj_node is not None
+                            and attr_node is not None
+                            and self._node_bytes(obj_node) == b"self"
+                        ):
+                            add_field(self._node_text(attr_node))
+                    break
 
-        walk(class_node)
         return fields
 
+    def _iter_field_nodes(self, class_node: tree_sitter.Node) -> Iterator[tree_sitter.Node]:
+        """Yield the field declarations of a class without descending into them.
+
+        For Python, also yields the expression statements inside methods, where
+        self.<attr> assignments declare fields.
+        """
+        descend_methods = self._language == "python"
+        cursor = class_node.walk()
+        depth = 0
+        # Depth of the outermost method being walked, or None outside methods
+        method_depth: int | None = None
+        while True:
+            node = cursor.node
+            node_type = node.type
+            descend = True
+            if node_type in METHOD_NODE_TYPES:
+                descend = descend_methods
+                if method_depth is None:
+                    method_depth = depth
+            elif node_type in FIELD_NODE_TYPES or (
+                method_depth is not None and node_type == "expression_statement"
+            ):
+                yield node
+                descend = False
+            if descend and cursor.goto_first_child():
+                depth += 1
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return
+                depth -= 1
+            if method_depth is not None and depth <= method_depth:
+                method_depth = None
+
     def _extract_super_classes_from_class(self, class_node: tree_sitter.Node) -> list[str]:
         """Extract parent class names from a class node."""
         super_classes: list[str] = []
 
         if self._language == "python":
-            for child in class_node.children:
-                if child.type == "argument_list":
-                    for arg in child.children:
-                        if arg.type == "identifier" or arg.type == "attribute":
-                            super_classes.append(self._node_text(arg))
+            superclasses = class_node.child_by_field_name("superclasses")
+            if superclasses is not None:
+                for arg in superclasses.children:
+                    if arg.type == "identifier" or arg.type == "attribute":
+                        super_classes.append(self._node_text(arg))
 
-        elif self._language in {"javascript", "typescript", "tsx"}:
+        elif self._language in JS_LIKE_LANGUAGES:
             seen: set[str] = set()
 
             def add_name(name: str) -> None:
@@ -897,27 +1419,20 @@ class CodeAnalyzer:
                     walk_heritage(child)
 
         elif self._language == "java":
-            for child in class_node.children:
-                if child.type == "superclass":
-                    for sub in child.children:
-                        if sub.type == "type_identifier":
-                            super_classes.append(self._node_text(sub))
-                        elif sub.type == "generic_type":
-                            for g in sub.children:
-                                if g.type == "type_identifier":
-                                    super_classes.append(self._node_text(g))
-                                    break
-                elif child.type == "super_interfaces":
-                    for sub in child.children:
-                        if sub.type == "type_list":
-                            for t in sub.children:
-                                if t.type == "type_identifier":
-                                    super_classes.append(self._node_text(t))
-                                elif t.type == "generic_type":
-                                    for g in t.children:
-                                        if g.type == "type_identifier":
-                                            super_classes.append(self._node_text(g))
-                                            break
+            type_nodes: list[tree_sitter.Node] = []
+            superclass = class_node.child_by_field_name("superclass")
+            if superclass is not None:
+                type_nodes.extend(superclass.children)
+            interfaces = class_node.child_by_field_name("interfaces")
+            if interfaces is not None:
+                for sub in interfaces.children:
+                    if sub.type == "type_list":
+                        type_nodes.extend(sub.children)
+            for t in type_nodes:
+                if t.type == "generic_type":
+                    t = next((g for g in t.children if g.type == "type_identifier"), None)
+                if t is not None and t.type == "type_identifier":
+                    super_classes.append(self._node_text(t))
 
         elif self._language == "go":
 
@@ -987,16 +1502,18 @@ class CodeAnalyzer:
                 return None
 
             for child in class_node.children:
-                if child.type == "type_spec":
-                    for sub in child.children:
-                        if sub.type == "struct_type":
-                            for field in sub.children:
-                                if field.type == "field_declaration_list":
-                                    for fd in field.children:
-                                        if fd.type == "field_declaration":
-                                            embedded = embedded_from_field_declaration(fd)
-                                            if embedded:
-                                                super_classes.append(embedded)
+                if child.type != "type_spec":
+                    continue
+                struct_type = child.child_by_field_name("type")
+                if struct_type is None or struct_type.type != "struct_type":
+                    continue
+                for field_list in struct_type.children:
+                    if field_list.type == "field_declaration_list":
+                        for fd in field_list.children:
+                            if fd.type == "field_declaration":
+                                embedded = embedded_from_field_declaration(fd)
+                                if embedded:
+                                    super_classes.append(embedded)
 
         return super_classes
 
@@ -1022,6 +1539,7 @@ class CodeAnalyzer:
 
     def _get_fields_from_class_node(self, class_name: str) -> list[FieldInfo]:
         """Get detailed field info for a specific class."""
+        self._ensure_tree()
         if not self._language or not self._tree:
             return []
 
@@ -1029,21 +1547,15 @@ class CodeAnalyzer:
         if not lang_info:
             return []
 
-        captures = self._run_query(lang_info.class_query)
+        captures = self._run_query("class")
         class_nodes = captures.get("class", [])
         name_nodes = captures.get("name", [])
 
+        class_name_bytes = class_name.encode("utf-8")
         target_class_node = None
-        for class_node in class_nodes:
-            for name_node in name_nodes:
-                if (
-                    class_node.start_byte <= name_node.start_byte
-                    and name_node.end_byte <= class_node.end_byte
-                    and self._node_text(name_node) == class_name
-                ):
-                    target_class_node = class_node
-                    break
-            if target_class_node:
+        for class_node, name_node in _match_names(class_nodes, name_nodes):
+            if name_node and self._node_bytes(name_node) == class_name_bytes:
+                target_class_node = class_node
                 break
 
         if not target_class_node:
@@ -1055,18 +1567,11 @@ class CodeAnalyzer:
         self, class_node: tree_sitter.Node, class_name: str
     ) -> list[FieldInfo]:
         """Extract detailed field information from a class node."""
-        if self._language in {"javascript", "typescript", "tsx"}:
+        if self._language in JS_LIKE_LANGUAGES:
             return self._extract_field_infos_js_like(class_node, class_name)
 
         fields: list[FieldInfo] = []
         seen: set[str] = set()
-        field_types = {"field_definition", "field_declaration"}
-        method_types = {
-            "function_definition",
-            "method_definition",
-            "method_declaration",
-            "constructor_declaration",
-        }
 
         def add_field(name: str, location: Location, field_type: str | None) -> None:
             if name and name not in seen:
@@ -1080,71 +1585,52 @@ class CodeAnalyzer:
                     )
                 )
 
-        def walk(node: tree_sitter.Node, inside_method: bool = False):
-            if node.type in method_types:
-                if self._language != "python":
-                    return
-                for child in node.children:
-                    walk(child, inside_method=True)
-                return
-            if node.type in field_types:
+        for node in self._iter_field_nodes(class_node):
+            if node.type in FIELD_NODE_TYPES:
                 name = ""
                 field_type = None
                 for child in node.children:
-                    if child.type in ("identifier", "property_identifier", "field_identifier"):
+                    if child.type in NAME_IDENTIFIER_TYPES:
                         name = self._node_text(child)
                     elif child.type == "variable_declarator":
                         for sub in child.children:
                             if sub.type == "identifier":
                                 name = self._node_text(sub)
                                 break
-                    elif child.type in (
-                        "type_annotation",
-                        "type",
-                        "type_identifier",
-                        "integral_type",
-                        "floating_point_type",
-                        "boolean_type",
-                        "generic_type",
-                        "array_type",
-                        "scoped_type_identifier",
-                    ):
+                    elif child.type in FIELD_TYPE_NODE_TYPES:
                         field_type = self._node_text(child)
                 if name:
                     add_field(name, self._node_location(node), field_type)
-                return
-            if self._language == "python" and node.type == "expression_statement" and inside_method:
-                for child in node.children:
-                    if child.type == "assignment":
-                        name = ""
-                        field_type = None
-                        left_node = child.child_by_field_name("left")
-                        if left_node is not None and left_node.type == "attribute":
-                            obj_node = left_node.child_by_field_name("object")
-                            attr_node = left_node.child_by_field_name("attribute")
-                            if (
-                                obj_node is not None
-                                and attr_node is not None
-                                and self._node_text(obj_node) == "self"
-                            ):
-                                name = self._node_text(attr_node)
-                        type_node = child.child_by_field_name("type")
-                        if type_node is not None:
-                            field_type = self._node_text(type_node)
-                        if name:
-                            add_field(name, self._node_location(child), field_type)
-                        break
-                return
+                continue
             for child in node.children:
-                walk(child, inside_method)
+                if child.type == "assignment":
+                    name = ""
+                    field_type = None
+                    left_node = child.child_by_field_name("left")
+                    if left_node is not None and left_node.type == "attribute":
+                        obj_node = left_node.child_by_field_name("object")
+                        attr_node = left_node.child_by_field_name("attribute")
+                        if (
+                            obj_node is not None
+                            and attr_node is not None
+                            and self._node_bytes(obj_node) == b"self"
+                        ):
+                            name = self._node_text(attr_node)
+                    type_node = child.child_by_field_name("type")
+                    if type_node is not None:
+                        field_type = self._node_text(type_node)
+                    if name:
+                        add_field(name, self._node_location(child), field_type)
+                    break
 
-        walk(class_node)
         return fields
 
     def get_calls(self) -> list[CallInfo]:
-        if self._calls_cache is not None:
-            return self._calls_cache
+        if self._calls_cache is None:
+            self._calls_cache = self._cached("calls", self._extract_calls)
+        return self._calls_cache
 
+    def _extract_calls(self) -> list[CallInfo]:
         if not self._language:
             return []
 
@@ -1152,46 +1638,49 @@ class CodeAnalyzer:
         if not lang_info:
             return []
 
-        captures = self._run_query(lang_info.call_query)
+        # Call sites in source order, outer calls first when they share a start (f(x).g())
+        captures = self._run_query("call")
         call_nodes = captures.get("call", [])
 
+        # Bound once: this loop runs for every call site in the file
+        node_text = self._node_text
+        find_function = self._find_enclosing_function
+        find_class = self._find_enclosing_class
+        is_java = self._language == "java"
+
         calls = []
         for call_node in call_nodes:
-            caller = self._find_enclosing_function(call_node)
-            caller_class_name = self._find_enclosing_class(call_node)
+            caller = find_function(call_node)
+            caller_class_name = find_class(call_node)
             callee = ""
             is_method = False
             obj_name = None
 
-            if self._language == "java":
+            if is_java:
                 if call_node.type == "object_creation_expression":
                     type_node = call_node.child_by_field_name("type")
                     if type_node:
                         if type_node.type == "generic_type":
                             for child in type_node.children:
                                 if child.type == "type_identifier":
-                                    callee = self._node_text(child)
+                                    callee = node_text(child)
                                     break
                         else:
-                            callee = self._node_text(type_node)
+                            callee = node_text(type_node)
                 else:
                     name_node = call_node.child_by_field_name("name")
                     object_node = call_node.child_by_field_name("object")
                     if name_node:
-                        callee = self._node_text(name_node)
+                        callee = node_text(name_node)
                     if object_node:
                         is_method = True
-                        obj_name = self._node_text(object_node)
+                        obj_name = node_text(object_node)
             else:
                 func_node = call_node.child_by_field_name("function")
                 if func_node:
                     if func_node.type == "identifier":
-                        callee = self._node_text(func_node)
-                    elif func_node.type in (
-                        "attribute",
-                        "member_expression",
-                        "selector_expression",
-                    ):
+                        callee = node_text(func_node)
+                    elif func_node.type in ATTRIBUTE_NODE_TYPES:
                         is_method = True
                         callee, obj_name = self._parse_attribute_node(func_node)
 
@@ -1207,10 +1696,19 @@ class CodeAnalyzer:
                     )
                 )
 
-        self._calls_cache = calls
         return calls
 
-    def get_imports(self) -> list[ImportInfo]:
+    def get_imports(self, query: str = "") -> list[ImportInfo]:
+        """Get all imports, optionally only those whose module contains query."""
+        if self._imports_cache is None:
+            self._imports_cache = self._cached("imports", self._extract_imports)
+        imports = self._imports_cache
+        if query:
+            matches = compile_name_filter(query)
+            return [i for i in imports if matches(i.module)]
+        return imports
+
+    def _extract_imports(self) -> list[ImportInfo]:
         if not self._language:
             return []
 
@@ -1218,7 +1716,7 @@ class CodeAnalyzer:
         if not lang_info:
             return []
 
-        captures = self._run_query(lang_info.import_query)
+        captures = self._run_query("import")
         module_nodes = captures.get("module", [])
         import_nodes = captures.get("import", [])
 
@@ -1234,7 +1732,17 @@ class CodeAnalyzer:
 
         return imports
 
-    def get_variables(self) -> list[VariableInfo]:
+    def get_variables(self, query: str = "") -> list[VariableInfo]:
+        """Get all variables, optionally only those whose name contains query."""
+        if self._variables_cache is None:
+            self._variables_cache = self._cached("variables", self._extract_variables)
+        variables = self._variables_cache
+        if query:
+            matches = compile_name_filter(query)
+            return [v for v in variables if matches(v.name)]
+        return variables
+
+    def _extract_variables(self) -> list[VariableInfo]:
         if not self._language:
             return []
 
@@ -1242,15 +1750,16 @@ class CodeAnalyzer:
         if not lang_info:
             return []
 
-        captures = self._run_query(lang_info.variable_query)
+        captures = self._run_query("variable")
         name_nodes = captures.get("name", [])
 
         variables = []
         for node in name_nodes:
+            name = self._node_text(node)
             scope = self._find_enclosing_function(node)
             variables.append(
                 VariableInfo(
-                    name=self._node_text(node),
+                    name=name,
                     location=self._node_location(node),
                     scope=scope,
                 )
@@ -1259,6 +1768,11 @@ class CodeAnalyzer:
         return variables
 
     def get_strings(self) -> list[StringLiteral]:
+        if self._strings_cache is None:
+            self._strings_cache = self._cached("strings", self._extract_strings)
+        return self._strings_cache
+
+    def _extract_strings(self) -> list[StringLiteral]:
         if not self._language:
             return []
 
@@ -1266,7 +1780,7 @@ class CodeAnalyzer:
         if not lang_info:
             return []
 
-        captures = self._run_query(lang_info.string_query)
+        captures = self._run_query("string")
         string_nodes = captures.get("string", [])
 
         strings = []
@@ -1276,7 +1790,8 @@ class CodeAnalyzer:
 
         return strings
 
-    def find_symbols(self, name: str) -> list[dict]:
+    def find_symbols(self, name: str, include_context: bool = True) -> list[dict]:
+        """Find references to an identifier, each with the source of its parent node as context."""
         if not self._source:
             return []
 
@@ -1288,29 +1803,90 @@ class CodeAnalyzer:
         if not self._tree:
             return []
 
-        refs: list[dict] = []
-
-        def walk(node: tree_sitter.Node) -> None:
-            if node.is_named and self._node_text(node) == name:
-                refs.append(
-                    {
-                        "type": node.type,
-                        "location": self._node_location(node).to_dict(),
-                        "context": self._node_text(node.parent) if node.parent else "",
-                    }
-                )
-            for child in node.children:
-                walk(child)
-
-        walk(self._tree.root_node)
+        # A single lookup is cheapest as a pruned walk; once a second name is looked
+        # up on this analyzer, index every short named node so later lookups are O(1).
+        if len(name_bytes) <= SYMBOL_INDEX_MAX_LEN:
+            self._symbol_lookups += 1
+            if self._symbol_index is None and self._symbol_lookups > 1:
+                self._symbol_index = self._build_symbol_index()
+        if self._symbol_index is not None and len(name_bytes) <= SYMBOL_INDEX_MAX_LEN:
+            nodes = self._symbol_index.get(name_bytes, [])
+        else:
+            nodes = self._find_symbol_nodes(name_bytes)
+        file = self.file_path or "<string>"
+        refs = []
+        for node in nodes:
+            ref = {
+                "type": node.type,
+                "location": {
+                    "file": file,
+                    "start_line": node.start_point.row + 1,
+                    "end_line": node.end_point.row + 1,
+                },
+            }
+            if include_context:
+                parent = node.parent
+                ref["context"] = self._node_text(parent) if parent else ""
+            refs.append(ref)
         return refs
 
+    def _find_symbol_nodes(self, name_bytes: bytes) -> list[tree_sitter.Node]:
+        """Named nodes whose text is name_bytes, in preorder."""
+        source = self._source
+        if source is None or self._tree is None:
+            return []
+        name_len = len(name_bytes)
+        occurrences = []
+        pos = source.find(name_bytes)
+        while pos != -1:
+            occurrences.append(pos)
+            pos = source.find(name_bytes, pos + 1)
+
+        # Iterative preorder walk that skips subtrees with no occurrence of the name
+        nodes = []
+        cursor = self._tree.walk()
+        while True:
+            node = cursor.node
+            start, end = node.start_byte, node.end_byte
+            i = bisect_left(occurrences, start)
+            if i < len(occurrences) and occurrences[i] + name_len <= end:
+                if end - start == name_len and node.is_named:
+                    nodes.append(node)
+                if cursor.goto_first_child():
+                    continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return nodes
+
+    def _build_symbol_index(self) -> dict[bytes, list[tree_sitter.Node]]:
+        """Index named nodes of up to SYMBOL_INDEX_MAX_LEN bytes by their text, in preorder."""
+        source = self._source
+        index: dict[bytes, list[tree_sitter.Node]] = {}
+        if source is None or self._tree is None:
+            return index
+        cursor = self._tree.walk()
+        while True:
+            node = cursor.node
+            start, end = node.start_byte, node.end_byte
+            if end - start <= SYMBOL_INDEX_MAX_LEN and node.is_named:
+                index.setdefault(source[start:end], []).append(node)
+            if cursor.goto_first_child():
+                continue
+            while not cursor.goto_next_sibling():
+                if not cursor.goto_parent():
+                    return index
+
     def get_class_by_name(self, class_name: str) -> ClassInfo | None:
         """Get a specific class by name."""
-        for cls in self.get_classes():
-            if cls.name == class_name:
-                return cls
-        return None
+        classes = self._classes_named(class_name)
+        return classes[0] if classes else None
+
+    def _classes_named(self, name: str) -> list[ClassInfo]:
+        if self._classes_by_name is None:
+            self._classes_by_name = {}
+            for cls in self.get_classes():
+                self._classes_by_name.setdefault(cls.name, []).append(cls)
+        return self._classes_by_name.get(name, [])
 
     def get_super_classes(self, class_name: str) -> list[ClassInfo]:
         """Get all parent classes of a specific class.
@@ -1321,13 +1897,12 @@ class CodeAnalyzer:
         if not target_class:
             return []
 
-        all_classes = self.get_classes()
-        class_map = {c.name: c for c in all_classes}
-
         result = []
         for parent_name in target_class.super_classes:
-            if parent_name in class_map:
-                result.append(class_map[parent_name])
+            # Last definition wins, as when mapping names over get_classes()
+            parents = self._classes_named(parent_name)
+            if parents:
+                result.append(parents[-1])
         return result
 
     def get_sub_classes(self, class_name: str) -> list[ClassInfo]:
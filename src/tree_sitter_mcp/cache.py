@@ -0,0 +1,170 @@
+"""Persistent on-disk cache for per-file analysis results."""
+
+from __future__ import annotations
+
+import atexit
+import dataclasses
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+from collections.abc import Callable
+from functools import cache
+from pathlib import Path
+from typing import Any
+
+CACHE_DIR_ENV = "TREE_SITTER_MCP_CACHE_DIR"
+CACHE_FILE_NAME = "analysis.sqlite"
+SCHEMA_VERSION = 4
+
+
+def source_digest(source: bytes) -> bytes:
+    """Digest used to detect changed file contents."""
+    return hashlib.sha256(source).digest()
+
+
+def strip_nodes(items: list[Any]) -> list[Any]:
+    """Drop tree-sitter node references, which cannot outlive their tree."""
+    stripped = []
+    for item in items:
+        if getattr(item, "node", None) is None:
+            stripped.append(item)
+        elif hasattr(item, "detach"):
+            stripped.append(item.detach())
+        else:
+            stripped.append(dataclasses.replace(item, node=None))
+    return stripped
+
+
+class AnalysisCache:
+    """SQLite-backed cache of extraction results keyed by (path, kind, content digest).
+
+    Tree-sitter trees cannot be serialized, so the cache stores the extracted
+    dataclasses instead. Entries also record the query version they were extracted
+    with, and the file's (mtime_ns, size) stamp so unchanged files are served
+    without hashing. Writes are buffered and committed in a single transaction.
+    """
+
+    FLUSH_THRESHOLD: int = 256
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending: dict[tuple[str, str], tuple[str, bytes, int, int, bytes]] = {}
+        self._conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._init_schema()
+        atexit.register(self.close)
+
+    def _init_schema(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        with self._conn:
+            if version != SCHEMA_VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS results")
+                self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "path TEXT NOT NULL, kind TEXT NOT NULL, version TEXT NOT NULL, sha BLOB NOT NULL, "
+                "mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, data BLOB NOT NULL, "
+                "PRIMARY KEY (path, kind))"
+            )
+
+    def get(
+        self,
+        path: str,
+        kind: str,
+        version: str,
+        stamp: tuple[int, int],
+        digest: Callable[[], bytes],
+    ) -> list[Any] | None:
+        """Return cached results, or None if missing, stale or from another query version.
+
+        The content digest is only computed when the stored stamp differs from ``stamp``.
+        """
+        with self._lock:
+            row = self._pending.get((path, kind))
+            if row is None:
+                try:
+                    row = self._conn.execute(
+                        "SELECT version, sha, mtime_ns, size, data FROM results "
+                        "WHERE path = ? AND kind = ?",
+                        (path, kind),
+                    ).fetchone()
+                except sqlite3.Error:
+                    return None
+                if row is None:
+                    return None
+        row_version, sha, mtime_ns, size, data = row
+        if row_version != version:
+            return None
+        if (mtime_ns, size) != stamp:
+            if sha != digest():
+                return None
+            # Same content under a new stamp (touch, checkout): store the new stamp so
+            # later lookups take the fast path again instead of rehashing the file
+            self._queue(path, kind, (version, sha, stamp[0], stamp[1], data))
+        try:
+            return pickle.loads(data)
+        except Exception:
+            return None
+
+    def put(
+        self,
+        path: str,
+        kind: str,
+        version: str,
+        stamp: tuple[int, int],
+        digest: bytes,
+        items: list[Any],
+    ) -> None:
+        """Queue results for writing; flushed in batches."""
+        data = pickle.dumps(strip_nodes(items), protocol=pickle.HIGHEST_PROTOCOL)
+        self._queue(path, kind, (version, digest, stamp[0], stamp[1], data))
+
+    def _queue(self, path: str, kind: str, row: tuple[str, bytes, int, int, bytes]) -> None:
+        with self._lock:
+            self._pending[(path, kind)] = row
+            if len(self._pending) < self.FLUSH_THRESHOLD:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        """Write all pending results in a single transaction."""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = [(path, kind, *row) for (path, kind), row in self._pending.items()]
+            self._pending.clear()
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO results "
+                        "(path, kind, version, sha, mtime_ns, size, data) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+            except sqlite3.Error:
+                pass
+
+    def close(self) -> None:
+        """Flush pending writes and close the connection."""
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+
+@cache
+def _open_cache(cache_dir: str) -> AnalysisCache | None:
+    try:
+        return AnalysisCache(os.path.join(cache_dir, CACHE_FILE_NAME))
+    except (OSError, sqlite3.Error):
+        return None
+
+
+def get_default_cache() -> AnalysisCache | None:
+    """Get the cache configured via TREE_SITTER_MCP_CACHE_DIR, or None if disabled."""
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if not cache_dir:
+        return None
+    return _open_cache(os.path.abspath(os.path.expanduser(cache_dir)))
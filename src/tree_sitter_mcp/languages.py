@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 from collections.abc import Callable
 from dataclasses import dataclass
 from functools import lru_cache
@@ -38,7 +40,7 @@ FILE_EXTENSION_MAP: dict[str, str] = {
 }
 
 
-@dataclass
+@dataclass(slots=True)
 class LanguageInfo:
     name: str
     extensions: list[str]
@@ -122,7 +124,7 @@ LANGUAGE_QUERIES: dict[str, LanguageInfo] = {
 
 
 def detect_language(file_path: str | Path) -> str | None:
-    ext = Path(file_path).suffix.lower()
+    ext = os.path.splitext(file_path)[1].lower()
     return FILE_EXTENSION_MAP.get(ext)
 
 
@@ -146,5 +148,14 @@ def get_language_info(language: str) -> LanguageInfo | None:
     return LANGUAGE_QUERIES.get(language)
 
 
+@lru_cache(maxsize=16)
+def get_query_version(language: str) -> str:
+    """Short hash of a language's queries, changing whenever any of them does."""
+    lang_info = LANGUAGE_QUERIES.get(language)
+    if not lang_info:
+        return ""
+    return hashlib.sha256(repr(lang_info).encode("utf-8")).hexdigest()[:16]
+
+
 def get_supported_languages() -> list[str]:
     return list(LANGUAGE_MODULES.keys())
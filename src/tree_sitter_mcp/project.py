@@ -2,7 +2,20 @@
 
 from __future__ import annotations
 
+import multiprocessing.util
+import os
+import re
+import sqlite3
+import stat
+import threading
+from collections import OrderedDict
+from collections.abc import Collection, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from operator import itemgetter
 from pathlib import Path
+from typing import Any
 
 from .analyzer import (
     CallInfo,
@@ -13,59 +26,216 @@ from .analyzer import (
     ImportInfo,
     VariableInfo,
 )
+from .cache import AnalysisCache, get_default_cache, strip_nodes
 from .languages import FILE_EXTENSION_MAP
 
+_GLOB_TOKEN = re.compile(r"\*|\?|\[[^\]]*\]?")
+_WORD_CHAR = re.compile(rb"\w")
+
+# VCS metadata, dependency, bytecode and tool cache directories, never part of the analyzed sources
+SKIPPED_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "node_modules",
+        "__pycache__",
+        ".venv",
+        "venv",
+        ".tox",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".next",
+        ".nuxt",
+    }
+)
+
+
+def _query_literal(query: str) -> str:
+    """Longest literal run of a name query, usable as a raw-text prefilter."""
+    return max(_GLOB_TOKEN.split(query), key=len)
+
+
+@lru_cache(maxsize=256)
+def _identifier_pattern(name: str) -> re.Pattern[bytes]:
+    """Regex matching a name only where it isn't part of a longer identifier.
+
+    The literal leads the pattern so the regex engine can scan for it directly;
+    the boundary checks are lookarounds, added only at word-character ends.
+    """
+    literal = name.encode("utf-8")
+    escaped = re.escape(literal)
+    pattern = escaped
+    if _WORD_CHAR.match(literal[:1]):
+        pattern += rb"(?<!\w" + escaped + rb")"
+    if _WORD_CHAR.match(literal[-1:]):
+        pattern += rb"(?!\w)"
+    return re.compile(pattern)
+
 
 def get_supported_extensions() -> set[str]:
     """Get all supported file extensions."""
     return set(FILE_EXTENSION_MAP.keys())
 
 
-def _validate_directory_path(path: str) -> Path:
-    p = Path(path)
-    if not p.exists():
-        raise FileNotFoundError(f"Path not found: {path}")
-    if not p.is_dir():
+def _validate_directory_path(path: str) -> str:
+    try:
+        st = os.stat(path)
+    except OSError:
+        raise FileNotFoundError(f"Path not found: {path}") from None
+    if not stat.S_ISDIR(st.st_mode):
         raise NotADirectoryError(f"Path must be a directory: {path}")
 
-    return p
+    return path
 
 
-def find_files(path: str) -> list[str]:
+def find_files(path: str, skipped_dirs: Collection[str] = SKIPPED_DIRS) -> list[str]:
     """Find all supported source files under a directory.
 
     Args:
         path: Directory path (searched recursively)
+        skipped_dirs: Names of directories not to descend into
 
     Returns:
         List of absolute file paths
     """
     directory = _validate_directory_path(path)
     extensions = get_supported_extensions()
-    files = [
-        str(p.resolve())
-        for p in directory.rglob("*")
-        if p.is_file() and p.suffix.lower() in extensions
-    ]
-    return sorted(set(files))
+    files = []
+    has_symlinks = False
+    # scandir entries know their type without a stat; directory symlinks aren't followed
+    pending = [os.path.realpath(directory)]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in skipped_dirs:
+                    pending.append(entry.path)
+            elif os.path.splitext(entry.name)[1].lower() in extensions and entry.is_file():
+                if entry.is_symlink():
+                    has_symlinks = True
+                    files.append(os.path.realpath(entry.path))
+                else:
+                    files.append(entry.path)
+    # Only a resolved symlink can repeat a path
+    if has_symlinks:
+        files = list(set(files))
+    files.sort()
+    return files
+
+
+def file_manifest(path: str) -> dict[str, tuple[int, int]]:
+    """Map each supported file under a directory to its (mtime_ns, size)."""
+    manifest = {}
+    for file_path in find_files(path):
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        manifest[file_path] = (st.st_mtime_ns, st.st_size)
+    return manifest
+
+
+SHARED_ANALYZERS_SIZE = 1024
+
+# Analyzers reused across ProjectAnalyzer instances, so that repeated tool calls on an
+# unchanged file keep its parsed tree and extracted results; keyed by path
+_shared_analyzers: OrderedDict[str, CodeAnalyzer] = OrderedDict()
+_shared_analyzers_lock = threading.Lock()
+
+
+def _get_shared_analyzer(file_path: str, cache: AnalysisCache | None) -> CodeAnalyzer | None:
+    """Get the analyzer of an unchanged file from an earlier project, or create one."""
+    with _shared_analyzers_lock:
+        analyzer = _shared_analyzers.get(file_path)
+        if analyzer is not None:
+            # Replaced rather than refreshed in place: other projects may be reading it
+            if analyzer._cache is cache and not analyzer.is_stale():
+                _shared_analyzers.move_to_end(file_path)
+                return analyzer
+            del _shared_analyzers[file_path]
+
+    try:
+        analyzer = CodeAnalyzer(file_path, cache=cache)
+    except Exception:
+        return None
+
+    with _shared_analyzers_lock:
+        _shared_analyzers[file_path] = analyzer
+        while len(_shared_analyzers) > SHARED_ANALYZERS_SIZE:
+            _shared_analyzers.popitem(last=False)
+    return analyzer
+
+
+# Persistent cache of a process pool worker, opened by _init_worker
+_worker_cache: AnalysisCache | None = None
+
+
+def _init_worker(cache_path: str | None) -> None:
+    """Open the worker's own cache connection; the parent's can't be shared across fork."""
+    global _worker_cache
+    if cache_path is None:
+        return
+    try:
+        _worker_cache = AnalysisCache(cache_path)
+    except (OSError, sqlite3.Error):
+        return
+    # Workers leave through os._exit, which skips atexit; finalizers still run
+    multiprocessing.util.Finalize(_worker_cache, _worker_cache.close, exitpriority=10)
+
+
+def _analyze_file(file_path: str, method: str, args: tuple) -> Any:
+    """Run a CodeAnalyzer method on a single file (process pool worker)."""
+    try:
+        analyzer = CodeAnalyzer(file_path, cache=_worker_cache)
+    except Exception:
+        return []
+    result = getattr(analyzer, method)(*args)
+    if isinstance(result, dict):
+        return {kind: strip_nodes(items) for kind, items in result.items()}
+    return strip_nodes(result)
 
 
 class ProjectAnalyzer:
     """Analyzes multiple source files in a project."""
 
     MAX_CACHED_ANALYZERS: int = 256
-
-    def __init__(self, path: str):
+    PARALLEL_MIN_FILES: int = 32
+
+    def __init__(
+        self,
+        path: str,
+        cache: AnalysisCache | None = None,
+        jobs: int = 1,
+        skipped_dirs: Collection[str] = SKIPPED_DIRS,
+        files: list[str] | None = None,
+    ):
         """Initialize with a directory.
 
         Args:
             path: Directory path (searched recursively)
+            cache: Persistent result cache (defaults to TREE_SITTER_MCP_CACHE_DIR if set)
+            jobs: Number of worker processes used for whole-project extraction
+            skipped_dirs: Names of directories not to descend into
+            files: Sorted source files of the directory, if already listed by
+                find_files() or file_manifest(); skips a second directory walk
         """
         self.path = path
-        self.files = find_files(path)
-        self._analyzers: dict[str, CodeAnalyzer] = {}
-        self._analyzer_order: list[str] = []
+        self.jobs = jobs
+        self.files = find_files(path, skipped_dirs) if files is None else files
+        self._cache = cache if cache is not None else get_default_cache()
+        # In LRU order, oldest first
+        self._analyzers: OrderedDict[str, CodeAnalyzer] = OrderedDict()
+        self._analyzers_lock = threading.Lock()
         self._file_contents_cache: dict[str, bytes] = {}
+        # Project-wide class lookups, built from one get_classes() pass on first use
+        self._classes_by_name: dict[str, list[ClassInfo]] | None = None
+        self._sub_classes: dict[str, list[ClassInfo]] | None = None
 
     def _get_file_contents(self, file_path: str) -> bytes | None:
         """Get cached file contents."""
@@ -85,103 +255,115 @@ class ProjectAnalyzer:
             return False
         return text.encode("utf-8") in content
 
+    def _file_mentions(self, file_path: str, name: str) -> bool:
+        """Check if a file contains a name as a whole identifier, without parsing AST."""
+        content = self._get_file_contents(file_path)
+        if content is None or name.encode("utf-8") not in content:
+            return False
+        return _identifier_pattern(name).search(content) is not None
+
     def _get_analyzer(self, file_path: str) -> CodeAnalyzer | None:
         """Get or create an analyzer for a file with LRU eviction."""
-        if file_path in self._analyzers:
-            self._analyzer_order.remove(file_path)
-            self._analyzer_order.append(file_path)
-            return self._analyzers[file_path]
+        # The MCP server may call into one project from several threads
+        with self._analyzers_lock:
+            analyzer = self._analyzers.get(file_path)
+            if analyzer is not None:
+                self._analyzers.move_to_end(file_path)
+                return analyzer
+
+            analyzer = _get_shared_analyzer(file_path, self._cache)
+            if analyzer is None:
+                return None
+
+            self._analyzers[file_path] = analyzer
+            while len(self._analyzers) > self.MAX_CACHED_ANALYZERS:
+                self._analyzers.popitem(last=False)
+
+            return analyzer
+
+    def clear(self) -> None:
+        """Drop all resident analyzers and cached file contents."""
+        with self._analyzers_lock:
+            self._analyzers.clear()
+        self._file_contents_cache.clear()
+        self._classes_by_name = self._sub_classes = None
+
+    def _map_files(self, method: str, files: list[str], *args: Any) -> Iterator[Any]:
+        """Run a CodeAnalyzer method on each file, in worker processes for large file sets."""
+        if self.jobs > 1 and len(files) >= self.PARALLEL_MIN_FILES:
+            chunksize = max(1, len(files) // (self.jobs * 4))
+            cache_path = self._cache.db_path if self._cache is not None else None
+            with ProcessPoolExecutor(
+                max_workers=self.jobs, initializer=_init_worker, initargs=(cache_path,)
+            ) as executor:
+                yield from executor.map(
+                    _analyze_file, files, repeat(method), repeat(args), chunksize=chunksize
+                )
+            return
+        for file_path in files:
+            analyzer = self._get_analyzer(file_path)
+            yield getattr(analyzer, method)(*args) if analyzer else []
 
-        try:
-            analyzer = CodeAnalyzer(file_path)
-        except Exception:
-            return None
+    def _flat_map(self, method: str, files: list[str], *args: Any) -> list[Any]:
+        """Concatenate the results of a CodeAnalyzer method over files."""
+        results = []
+        for items in self._map_files(method, files, *args):
+            results.extend(items)
+        return results
 
-        self._analyzers[file_path] = analyzer
-        self._analyzer_order.append(file_path)
+    def _files_matching(self, query: str) -> list[str]:
+        """Files that may hold names matching a query, judged by its longest literal run."""
+        literal = _query_literal(query)
+        if not literal:
+            return self.files
+        return [p for p in self.files if self._file_contains_text(p, literal)]
 
-        while len(self._analyzers) > self.MAX_CACHED_ANALYZERS:
-            oldest = self._analyzer_order.pop(0)
-            del self._analyzers[oldest]
+    def analyze_files(self, files: list[str] | None = None) -> dict[str, dict[str, list[Any]]]:
+        """Extract every view of each file, using one query pass per file.
 
-        return analyzer
+        Args:
+            files: Files to analyze (defaults to all project files)
+
+        Returns:
+            Mapping of file path to {"functions", "classes", "calls", "imports",
+            "variables", "strings"} results; files that fail to load are omitted
+        """
+        files = self.files if files is None else files
+        return {
+            file_path: result
+            for file_path, result in zip(files, self._map_files("analyze", files), strict=True)
+            if result
+        }
 
     def get_functions(self, query: str = "") -> list[FunctionInfo]:
         """Get all functions from all files."""
-        functions = []
-        for file_path in self.files:
-            if query and not self._file_contains_text(file_path, query):
-                continue
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                for f in analyzer.get_functions():
-                    if not query or query in f.name:
-                        functions.append(f)
-        return functions
+        return self._flat_map("get_functions", self._files_matching(query), query)
 
     def get_classes(self, query: str = "") -> list[ClassInfo]:
         """Get all classes from all files."""
-        classes = []
-        for file_path in self.files:
-            if query and not self._file_contains_text(file_path, query):
-                continue
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                for c in analyzer.get_classes():
-                    if not query or query in c.name:
-                        classes.append(c)
-        return classes
+        return self._flat_map("get_classes", self._files_matching(query), query)
 
     def get_fields(self, class_name: str) -> list[FieldInfo]:
         """Get all fields from all files, optionally filtered by class name."""
-        fields = []
-        for file_path in self.files:
-            if not self._file_contains_text(file_path, class_name):
-                continue
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                fields.extend(analyzer.get_fields(class_name))
-        return fields
+        files = [p for p in self.files if self._file_mentions(p, class_name)]
+        return self._flat_map("get_fields", files, class_name)
 
     def get_calls(self) -> list[CallInfo]:
         """Get all function calls from all files."""
-        calls = []
-        for file_path in self.files:
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                calls.extend(analyzer.get_calls())
-        return calls
+        return self._flat_map("get_calls", self.files)
 
     def get_imports(self, query: str = "") -> list[ImportInfo]:
         """Get all imports from all files."""
-        imports = []
-        for file_path in self.files:
-            if query and not self._file_contains_text(file_path, query):
-                continue
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                for i in analyzer.get_imports():
-                    if not query or query in i.module:
-                        imports.append(i)
-        return imports
+        return self._flat_map("get_imports", self._files_matching(query), query)
 
     def get_variables(self, query: str = "") -> list[VariableInfo]:
         """Get all variables from all files."""
-        variables = []
-        for file_path in self.files:
-            if query and not self._file_contains_text(file_path, query):
-                continue
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                for v in analyzer.get_variables():
-                    if not query or query in v.name:
-                        variables.append(v)
-        return variables
+        return self._flat_map("get_variables", self._files_matching(query), query)
 
     def get_function_by_name(self, name: str, class_name: str | None = None) -> FunctionInfo | None:
         """Find a function by name across all files, optionally filtering by class_name."""
         for file_path in self.files:
-            if not self._file_contains_text(file_path, name):
+            if not self._file_mentions(file_path, name):
                 continue
             analyzer = self._get_analyzer(file_path)
             if analyzer:
@@ -194,70 +376,70 @@ class ProjectAnalyzer:
         self, name: str, class_name: str | None = None
     ) -> list[FunctionInfo]:
         """Find all functions with a given name across all files, optionally filtering by class_name."""
-        functions = []
-        for file_path in self.files:
-            if not self._file_contains_text(file_path, name):
-                continue
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                funcs = analyzer.get_all_functions_by_name(name, class_name)
-                functions.extend(funcs)
-        return functions
+        files = [p for p in self.files if self._file_mentions(p, name)]
+        return self._flat_map("get_all_functions_by_name", files, name, class_name)
 
     def get_callers(self, function_name: str, class_name: str | None = None) -> list[dict]:
         """Find all callers of a function across all files."""
+        files = [p for p in self.files if self._file_mentions(p, function_name)]
+        file_callers = self._map_files("get_function_callers", files, function_name, class_name)
         callers = []
-        for file_path in self.files:
-            if not self._file_contains_text(file_path, function_name):
-                continue
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                file_callers = analyzer.get_function_callers(function_name, class_name)
-                for caller_info in file_callers:
-                    callers.append(
-                        {
-                            "caller": caller_info["caller"],
-                            "line": caller_info["line"],
-                            "file": file_path,
-                            "target_class": caller_info.get("target_class"),
-                        }
-                    )
-        return sorted(callers, key=lambda x: (x["file"], x["line"]))
+        for file_path, items in zip(files, file_callers, strict=True):
+            for caller_info in items:
+                callers.append(
+                    {
+                        "caller": caller_info["caller"],
+                        "line": caller_info["line"],
+                        "file": file_path,
+                        "target_class": caller_info.get("target_class"),
+                    }
+                )
+        return sorted(callers, key=itemgetter("file", "line"))
 
     def get_callees(self, function_name: str, class_name: str | None = None) -> list[dict]:
         """Find all functions called by a function across all files."""
+        files = [p for p in self.files if self._file_mentions(p, function_name)]
+        # Only functions defined under this name; no fallback to inferred anonymous names
+        file_callees = self._map_files(
+            "get_function_callees", files, function_name, class_name, True
+        )
         results = []
-        for file_path in self.files:
-            if not self._file_contains_text(file_path, function_name):
-                continue
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                funcs = analyzer.get_all_functions_by_name(function_name, class_name)
-                if funcs:
-                    callees = analyzer.get_function_callees(function_name, class_name)
-                    for c in callees:
-                        results.append(
-                            {
-                                "callee": c["callee"],
-                                "line": c["line"],
-                                "file": file_path,
-                                "class_name": c.get("class_name"),
-                            }
-                        )
-        return sorted(results, key=lambda x: (x["file"], x["line"]))
+        for file_path, callees in zip(files, file_callees, strict=True):
+            for c in callees:
+                results.append(
+                    {
+                        "callee": c["callee"],
+                        "line": c["line"],
+                        "file": file_path,
+                        "class_name": c.get("class_name"),
+                    }
+                )
+        return sorted(results, key=itemgetter("file", "line"))
 
     def get_function_variables(
         self, function_name: str, class_name: str | None = None
     ) -> list[dict]:
         """Get all variables in a function across all files."""
+        return self.get_function_with_variables(function_name, class_name)[1]
+
+    def get_function_strings(self, function_name: str, class_name: str | None = None) -> list[dict]:
+        """Get all strings in a function across all files."""
+        return self.get_function_with_strings(function_name, class_name)[1]
+
+    def get_function_with_variables(
+        self, function_name: str, class_name: str | None = None
+    ) -> tuple[list[FunctionInfo], list[dict]]:
+        """Find matching functions and the variables declared in them in one pass."""
+        functions: list[FunctionInfo] = []
         results = []
         for file_path in self.files:
-            if not self._file_contains_text(file_path, function_name):
+            if not self._file_mentions(file_path, function_name):
                 continue
             analyzer = self._get_analyzer(file_path)
             if analyzer:
-                variables = analyzer.get_function_variables(function_name, class_name)
-                for v in variables:
+                funcs = analyzer.get_all_functions_by_name(function_name, class_name)
+                functions.extend(funcs)
+                for v in analyzer.get_variables_in(funcs):
                     results.append(
                         {
                             "name": v.name,
@@ -265,18 +447,22 @@ class ProjectAnalyzer:
                             "file": file_path,
                         }
                     )
-        return sorted(results, key=lambda x: (x["file"], x["line"]))
+        return functions, sorted(results, key=itemgetter("file", "line"))
 
-    def get_function_strings(self, function_name: str, class_name: str | None = None) -> list[dict]:
-        """Get all strings in a function across all files."""
+    def get_function_with_strings(
+        self, function_name: str, class_name: str | None = None
+    ) -> tuple[list[FunctionInfo], list[dict]]:
+        """Find matching functions and the string literals in them in one pass."""
+        functions: list[FunctionInfo] = []
         results = []
         for file_path in self.files:
-            if not self._file_contains_text(file_path, function_name):
+            if not self._file_mentions(file_path, function_name):
                 continue
             analyzer = self._get_analyzer(file_path)
             if analyzer:
-                strings = analyzer.get_function_strings(function_name, class_name)
-                for s in strings:
+                funcs = analyzer.get_all_functions_by_name(function_name, class_name)
+                functions.extend(funcs)
+                for s in analyzer.get_strings_in(funcs):
                     results.append(
                         {
                             "value": s.value,
@@ -284,24 +470,17 @@ class ProjectAnalyzer:
                             "file": file_path,
                         }
                     )
-        return sorted(results, key=lambda x: (x["file"], x["line"]))
+        return functions, sorted(results, key=itemgetter("file", "line"))
 
-    def find_symbols(self, name: str) -> list[dict]:
+    def find_symbols(self, name: str, include_context: bool = True) -> list[dict]:
         """Find all references to an identifier across all files."""
-        refs = []
-        for file_path in self.files:
-            if not self._file_contains_text(file_path, name):
-                continue
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                file_refs = analyzer.find_symbols(name)
-                refs.extend(file_refs)
-        return refs
+        files = [p for p in self.files if self._file_mentions(p, name)]
+        return self._flat_map("find_symbols", files, name, include_context)
 
     def get_class_by_name(self, class_name: str) -> ClassInfo | None:
         """Find a class by name across all files."""
         for file_path in self.files:
-            if not self._file_contains_text(file_path, class_name):
+            if not self._file_mentions(file_path, class_name):
                 continue
             analyzer = self._get_analyzer(file_path)
             if analyzer:
@@ -310,37 +489,35 @@ class ProjectAnalyzer:
                     return cls
         return None
 
+    def _build_class_indexes(self) -> None:
+        classes_by_name: dict[str, list[ClassInfo]] = {}
+        sub_classes: dict[str, list[ClassInfo]] = {}
+        for cls in self.get_classes():
+            classes_by_name.setdefault(cls.name, []).append(cls)
+            for parent_name in dict.fromkeys(cls.super_classes):
+                sub_classes.setdefault(parent_name, []).append(cls)
+        self._classes_by_name, self._sub_classes = classes_by_name, sub_classes
+
     def get_super_classes(self, class_name: str) -> list[ClassInfo]:
         """Get all parent classes of a specific class across all files.
 
-        First finds the target class, then searches for its parent classes.
+        The first class with the name is the target; a parent name defined more
+        than once resolves to its last definition.
         """
-        target_class = None
-        for file_path in self.files:
-            analyzer = self._get_analyzer(file_path)
-            if analyzer:
-                cls = analyzer.get_class_by_name(class_name)
-                if cls:
-                    target_class = cls
-                    break
-
-        if not target_class:
+        if self._classes_by_name is None:
+            self._build_class_indexes()
+        classes_by_name = self._classes_by_name or {}
+        targets = classes_by_name.get(class_name)
+        if not targets:
             return []
-
-        all_classes = self.get_classes()
-        class_map = {c.name: c for c in all_classes}
-
-        result = []
-        for parent_name in target_class.super_classes:
-            if parent_name in class_map:
-                result.append(class_map[parent_name])
-        return result
+        return [
+            classes_by_name[parent_name][-1]
+            for parent_name in targets[0].super_classes
+            if parent_name in classes_by_name
+        ]
 
     def get_sub_classes(self, class_name: str) -> list[ClassInfo]:
         """Get all child classes that inherit from a specific class across all files."""
-        all_classes = self.get_classes()
-        result = []
-        for cls in all_classes:
-            if class_name in cls.super_classes:
-                result.append(cls)
-        return result
+        if self._sub_classes is None:
+            self._build_class_indexes()
+        return list((self._sub_classes or {}).get(class_name, []))
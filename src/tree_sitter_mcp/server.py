@@ -3,10 +3,22 @@
 from __future__ import annotations
 
 import os
+import threading
+from collections import OrderedDict
 
 from fastmcp import FastMCP
 
-from .project import ProjectAnalyzer
+from .analyzer import warm_up
+from .project import ProjectAnalyzer, file_manifest
+
+PRELOAD_LANGUAGES_ENV = "TREE_SITTER_MCP_PRELOAD_LANGUAGES"
+MAX_CACHED_PROJECTS = 8
+
+# Projects reused across tool calls while none of their files change, keyed by real path
+_projects: OrderedDict[str, tuple[dict, ProjectAnalyzer]] = OrderedDict()
+_projects_lock = threading.Lock()
+# Per-path locks, so concurrent calls on one project share a build without holding up others
+_build_locks: dict[str, threading.Lock] = {}
 
 mcp = FastMCP(
     name="tree-sitter-mcp",
@@ -18,17 +30,49 @@ mcp = FastMCP(
 )
 
 
+def _get_resident_project(path: str, manifest: dict) -> ProjectAnalyzer | None:
+    with _projects_lock:
+        entry = _projects.get(path)
+        if entry is None or entry[0] != manifest:
+            return None
+        _projects.move_to_end(path)
+        return entry[1]
+
+
+def _get_project(path: str) -> ProjectAnalyzer:
+    """Get a project's analyzer, reused until a file is added, removed or changed."""
+    manifest = file_manifest(path)
+    project = _get_resident_project(path, manifest)
+    if project is not None:
+        return project
+
+    with _projects_lock:
+        build_lock = _build_locks.setdefault(path, threading.Lock())
+    with build_lock:
+        # Another call may have built it while this one waited
+        project = _get_resident_project(path, manifest)
+        if project is not None:
+            return project
+        project = ProjectAnalyzer(path, files=list(manifest))
+        with _projects_lock:
+            _projects[path] = (manifest, project)
+            while len(_projects) > MAX_CACHED_PROJECTS:
+                evicted, _ = _projects.popitem(last=False)
+                _build_locks.pop(evicted, None)
+    return project
+
+
 @mcp.tool
 def get_functions(path: str, query: str = "") -> dict:
     """Extract all function/method definitions.
 
     Args:
         path: Directory path (searched recursively)
-        query: Optional filter string for fuzzy matching function/method names (contains match)
+        query: Optional filter for function/method names (contains match, or glob with * ? [])
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
+        project = _get_project(path)
         functions = project.get_functions(query=query)
         return {
             "path": path,
@@ -46,11 +90,11 @@ def get_classes(path: str, query: str = "") -> dict:
 
     Args:
         path: Directory path (searched recursively)
-        query: Optional filter string for fuzzy matching class names (contains match)
+        query: Optional filter for class names (contains match, or glob with * ? [])
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
+        project = _get_project(path)
         classes = project.get_classes(query=query)
         return {
             "path": path,
@@ -72,7 +116,7 @@ def get_fields(path: str, class_name: str) -> dict:
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
+        project = _get_project(path)
         fields = project.get_fields(class_name)
         return {
             "path": path,
@@ -91,11 +135,11 @@ def get_imports(path: str, query: str = "") -> dict:
 
     Args:
         path: Directory path (searched recursively)
-        query: Optional filter string for fuzzy matching module names (contains match)
+        query: Optional filter for module names (contains match, or glob with * ? [])
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
+        project = _get_project(path)
         imports = project.get_imports(query=query)
         return {
             "path": path,
@@ -113,11 +157,11 @@ def get_variables(path: str, query: str = "") -> dict:
 
     Args:
         path: Directory path (searched recursively)
-        query: Optional filter string for fuzzy matching variable names (contains match)
+        query: Optional filter for variable names (contains match, or glob with * ? [])
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
+        project = _get_project(path)
         variables = project.get_variables(query=query)
         return {
             "path": path,
@@ -140,7 +184,7 @@ def get_callers(path: str, function_name: str, class_name: str | None = None) ->
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
+        project = _get_project(path)
         callers = project.get_callers(function_name, class_name)
         return {
             "path": path,
@@ -164,7 +208,7 @@ def get_callees(path: str, function_name: str, class_name: str | None = None) ->
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
+        project = _get_project(path)
         callees = project.get_callees(function_name, class_name)
         return {
             "path": path,
@@ -178,17 +222,18 @@ def get_callees(path: str, function_name: str, class_name: str | None = None) ->
 
 
 @mcp.tool
-def find_symbols(path: str, name: str) -> dict:
+def find_symbols(path: str, name: str, include_context: bool = True) -> dict:
     """Find all references to a specific identifier.
 
     Args:
         path: Directory path (searched recursively)
         name: Identifier name to search for
+        include_context: Include the source of each reference's enclosing node
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
-        refs = project.find_symbols(name)
+        project = _get_project(path)
+        refs = project.find_symbols(name, include_context)
         return {
             "path": path,
             "files_searched": len(project.files),
@@ -211,7 +256,7 @@ def get_function_definition(path: str, function_name: str, class_name: str | Non
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
+        project = _get_project(path)
         functions = project.get_all_functions_by_name(function_name, class_name)
         if not functions:
             return {"error": f"Function '{function_name}' not found"}
@@ -237,11 +282,10 @@ def get_function_variables(path: str, function_name: str, class_name: str | None
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
-        functions = project.get_all_functions_by_name(function_name, class_name)
+        project = _get_project(path)
+        functions, variables = project.get_function_with_variables(function_name, class_name)
         if not functions:
             return {"error": f"Function '{function_name}' not found"}
-        variables = project.get_function_variables(function_name, class_name)
         return {
             "path": path,
             "files_searched": len(project.files),
@@ -265,11 +309,10 @@ def get_function_strings(path: str, function_name: str, class_name: str | None =
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
-        functions = project.get_all_functions_by_name(function_name, class_name)
+        project = _get_project(path)
+        functions, strings = project.get_function_with_strings(function_name, class_name)
         if not functions:
             return {"error": f"Function '{function_name}' not found"}
-        strings = project.get_function_strings(function_name, class_name)
         return {
             "path": path,
             "files_searched": len(project.files),
@@ -292,7 +335,7 @@ def get_super_classes(path: str, class_name: str) -> dict:
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
+        project = _get_project(path)
         super_classes = project.get_super_classes(class_name)
         return {
             "path": path,
@@ -315,7 +358,7 @@ def get_sub_classes(path: str, class_name: str) -> dict:
     """
     try:
         path = os.path.realpath(path)
-        project = ProjectAnalyzer(path)
+        project = _get_project(path)
         sub_classes = project.get_sub_classes(class_name)
         return {
             "path": path,
@@ -329,6 +372,11 @@ def get_sub_classes(path: str, class_name: str) -> dict:
 
 
 def main():
+    # Compile queries in the background so the first tool call doesn't pay for it
+    preload = os.environ.get(PRELOAD_LANGUAGES_ENV)
+    languages = None if preload is None else [s.strip() for s in preload.split(",") if s.strip()]
+    if languages != []:
+        threading.Thread(target=warm_up, args=(languages,), daemon=True).start()
     mcp.run()
 
 
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from tree_sitter_mcp.analyzer import CodeAnalyzer, _compute_edit, _reparse, compile_name_filter
+from tree_sitter_mcp.languages import get_parser
+
+EDITS = [
+    # Multi-byte UTF-8 before the edit, so byte and character columns differ
+    ("def f():\n    s = 'héllo'; x = 1\n", "def f():\n    s = 'héllo'; x = 22\n"),
+    ("def f():\n    return 'ü'\n", "def f():\n    return 'üü'\n"),
+    # Appending at and truncating from EOF
+    ("def f():\n    pass\n", "def f():\n    pass\n\n\ndef g():\n    pass\n"),
+    ("def f():\n    pass\n\n\ndef g():\n    pass\n", "def f():\n    pass\n"),
+    ("def f():\n    pass", "def f():\n    pass\n"),
+    ("", "def f():\n    pass\n"),
+    ("x = 1\n", "x = 1\n"),
+]
+
+
+def test_function_body_survives_truncated_file(tmp_path):
+    path = tmp_path / "big.py"
+    path.write_text("".join(f"def func{i}(x):\n    return x + {i}\n" for i in range(50000)))
+
+    functions = CodeAnalyzer(str(path)).get_functions()
+    path.write_text("")
+
+    assert functions[-1].body == "def func49999(x):\n    return x + 49999"
+
+
+def test_filtered_lookups_share_one_extraction(tmp_path, monkeypatch):
+    path = tmp_path / "mod.py"
+    path.write_text("def alpha():\n    pass\n\n\ndef beta():\n    pass\n")
+    extractions = []
+    extract = CodeAnalyzer._extract_functions
+
+    def counting_extract(self):
+        extractions.append(1)
+        return extract(self)
+
+    monkeypatch.setattr(CodeAnalyzer, "_extract_functions", counting_extract)
+    analyzer = CodeAnalyzer(str(path))
+
+    assert [f.name for f in analyzer.get_functions("alp")] == ["alpha"]
+    assert [f.name for f in analyzer.get_functions("b*")] == ["beta"]
+    assert [f.name for f in analyzer.get_functions()] == ["alpha", "beta"]
+    assert len(extractions) == 1
+
+
+def test_same_stamp_edit_of_fresh_file_is_seen(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("def aaa():\n    pass\n")
+    st = os.stat(path)
+    before = CodeAnalyzer(str(path))
+    assert [f.name for f in before.get_functions()] == ["aaa"]
+
+    # A same-size edit within the filesystem's mtime granularity keeps the stamp
+    path.write_text("def bbb():\n    pass\n")
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert before.is_stale()
+    assert [f.name for f in CodeAnalyzer(str(path)).get_functions()] == ["bbb"]
+
+
+@pytest.mark.parametrize(
+    ("query", "name", "matches"),
+    [
+        ("get", "get_user", True),
+        ("user", "get_user", True),
+        ("User", "get_user", False),
+        ("get_*", "get_user", True),
+        ("get_*", "set_get_user", False),
+        ("*_user", "get_user", True),
+        ("get_?ser", "get_user", True),
+        ("get_[uv]ser", "get_user", True),
+        ("get_[!u]ser", "get_user", False),
+        ("get", "forget", True),
+        # A glob must match the whole name, not a prefix
+        ("get*r", "get_users", False),
+        ("", "anything", True),
+    ],
+)
+def test_compile_name_filter(query, name, matches):
+    assert bool(compile_name_filter(query)(name)) is matches
+
+
+@pytest.mark.parametrize(("old", "new"), EDITS)
+def test_reparse_matches_full_parse(old, new):
+    parser = get_parser("python")
+    old_bytes, new_bytes = old.encode(), new.encode()
+
+    tree = _reparse(parser, old_bytes, parser.parse(old_bytes), new_bytes)
+
+    assert str(tree.root_node) == str(parser.parse(new_bytes).root_node)
+    assert tree.root_node.end_byte == len(new_bytes)
+
+
+def test_compute_edit_uses_byte_offsets_and_columns():
+    old = "s = 'é'\nx = 1\n".encode()
+    new = "s = 'é'\nx = 22\n".encode()
+
+    assert _compute_edit(old, new) == {
+        "start_byte": 13,
+        "old_end_byte": 14,
+        "new_end_byte": 15,
+        "start_point": (1, 4),
+        "old_end_point": (1, 5),
+        "new_end_point": (1, 6),
+    }
+
+
+def test_compute_edit_at_eof():
+    old = b"a = 1\n"
+    new = b"a = 1\nb = 2\n"
+
+    assert _compute_edit(old, new) == {
+        "start_byte": 6,
+        "old_end_byte": 6,
+        "new_end_byte": 12,
+        "start_point": (1, 0),
+        "old_end_point": (1, 0),
+        "new_end_point": (2, 0),
+    }
+    assert _compute_edit(new, old)["old_end_point"] == (2, 0)
+
+
+@pytest.mark.parametrize(("old", "new"), EDITS)
+def test_apply_edit_matches_fresh_analysis(tmp_path, old, new):
+    path = tmp_path / "mod.py"
+    path.write_bytes(old.encode())
+    analyzer = CodeAnalyzer(str(path))
+    analyzer.get_functions()
+
+    analyzer.apply_edit(new.encode())
+    path.write_bytes(new.encode())
+    fresh = CodeAnalyzer(str(path))
+    fresh._ensure_tree()
+
+    assert str(analyzer._tree.root_node) == str(fresh._tree.root_node)
+    assert [
+        (f.name, f.location.start_line, f.location.end_line) for f in analyzer.get_functions()
+    ] == [(f.name, f.location.start_line, f.location.end_line) for f in fresh.get_functions()]
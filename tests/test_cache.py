@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import sqlite3
+
+from tree_sitter_mcp.cache import AnalysisCache
+from tree_sitter_mcp.project import ProjectAnalyzer
+
+
+def _write_project(root, count: int) -> None:
+    for i in range(count):
+        (root / f"mod{i}.py").write_text(f"def func{i}(x):\n    return x + {i}\n")
+
+
+def _cached_rows(db_path) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+
+def test_parallel_extraction_populates_cache(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_project(src, ProjectAnalyzer.PARALLEL_MIN_FILES)
+    db_path = tmp_path / "cache" / "analysis.sqlite"
+
+    project = ProjectAnalyzer(str(src), cache=AnalysisCache(str(db_path)), jobs=2)
+    functions = project.get_functions()
+
+    assert len(functions) == ProjectAnalyzer.PARALLEL_MIN_FILES
+    assert _cached_rows(db_path) == ProjectAnalyzer.PARALLEL_MIN_FILES
+
+
+def test_parallel_extraction_reads_cache(tmp_path):
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_project(src, ProjectAnalyzer.PARALLEL_MIN_FILES)
+    cache = AnalysisCache(str(tmp_path / "cache" / "analysis.sqlite"))
+
+    serial = ProjectAnalyzer(str(src), cache=cache, jobs=1).get_functions()
+    cache.flush()
+    parallel = ProjectAnalyzer(str(src), cache=cache, jobs=2).get_functions()
+
+    assert [f.name for f in parallel] == [f.name for f in serial]
+
+
+def test_touched_file_refreshes_stored_stamp(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("def func(x):\n    return x\n")
+    cache = AnalysisCache(str(tmp_path / "cache" / "analysis.sqlite"))
+    cache.put(str(path), "functions", "v1", (1, 10), b"sha", [])
+    digests = []
+
+    def digest() -> bytes:
+        digests.append(1)
+        return b"sha"
+
+    assert cache.get(str(path), "functions", "v1", (2, 10), digest) == []
+    assert cache.get(str(path), "functions", "v1", (2, 10), digest) == []
+    assert len(digests) == 1
+
+    cache.flush()
+    reopened = AnalysisCache(cache.db_path)
+    assert reopened.get(str(path), "functions", "v1", (2, 10), digest) == []
+    assert len(digests) == 1
+
+
+def test_other_query_version_misses(tmp_path):
+    cache = AnalysisCache(str(tmp_path / "analysis.sqlite"))
+    cache.put("mod.py", "functions", "v1", (1, 10), b"sha", [])
+
+    assert cache.get("mod.py", "functions", "v1", (1, 10), lambda: b"sha") == []
+    assert cache.get("mod.py", "functions", "v2", (1, 10), lambda: b"sha") is None
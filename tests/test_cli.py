@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import io
+import json
+import sqlite3
+import sys
+
+import pytest
+
+from tree_sitter_analyzer import cli
+from tree_sitter_mcp.cache import CACHE_DIR_ENV, CACHE_FILE_NAME, get_default_cache
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_output_to_text_only_stream(monkeypatch, use_orjson):
+    if use_orjson:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(cli, "orjson", None)
+    out = io.StringIO()
+    monkeypatch.setattr(sys, "stdout", out)
+
+    cli._output_result({"name": "café", "items": [1, 2]}, "json")
+
+    assert json.loads(out.getvalue()) == {"name": "café", "items": [1, 2]}
+
+
+def test_cache_dir_option_populates_cache(tmp_path, monkeypatch):
+    src, cache_dir = tmp_path / "src", tmp_path / "cache"
+    src.mkdir()
+    (src / "a.py").write_text("def one():\n    pass\n")
+    # main() sets the variable for worker processes; have it restored afterwards
+    monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+    monkeypatch.setattr(sys, "stdout", io.StringIO())
+    argv = ["tree-sitter-analyzer", "--cache-dir", str(cache_dir), "functions", str(src), "--json"]
+    monkeypatch.setattr(sys, "argv", argv)
+
+    assert cli.main() == 0
+    assert [f["name"] for f in json.loads(sys.stdout.getvalue())["functions"]] == ["one"]
+    get_default_cache().flush()
+    with sqlite3.connect(cache_dir / CACHE_FILE_NAME) as conn:
+        kinds = [row[0] for row in conn.execute("SELECT kind FROM results")]
+    assert kinds == ["functions"]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+
+from tree_sitter_analyzer import cli, daemon
+
+
+def _payload(*argv: str) -> dict:
+    _, args = cli._parse_args(list(argv))
+    payload = {k: v for k, v in vars(args).items() if k not in ("func", "daemon", "cache_dir")}
+    payload["path"] = os.path.realpath(args.path)
+    return payload
+
+
+def _write(path, text: str) -> None:
+    path.write_text(text)
+    st = os.stat(path)
+    # Make the change visible to the (mtime_ns, size) stamp even on coarse clocks
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+
+def test_changed_project_keeps_others_resident(tmp_path):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+    (first / "a.py").write_text("def one():\n    pass\n")
+    (second / "b.py").write_text("def two():\n    pass\n")
+
+    cli._handle_daemon_request(_payload("functions", str(first)))
+    cli._handle_daemon_request(_payload("functions", str(second)))
+    resident = cli._get_project(os.path.realpath(second))
+
+    _write(first / "a.py", "def one():\n    pass\n\n\ndef three():\n    pass\n")
+    result = cli._handle_daemon_request(_payload("functions", str(first)))
+
+    assert [f["name"] for f in result["functions"]] == ["one", "three"]
+    assert cli._get_project(os.path.realpath(second)) is resident
+
+
+def test_request_round_trip(tmp_path):
+    (tmp_path / "a.py").write_text("def one():\n    pass\n")
+    socket_path = str(tmp_path / "tsa.sock")
+    threading.Thread(
+        target=daemon.serve, args=(socket_path, cli._handle_daemon_request), daemon=True
+    ).start()
+    deadline = time.monotonic() + 5
+    while not daemon._is_listening(socket_path):
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+    result = daemon.request(socket_path, _payload("functions", str(tmp_path)))
+    error = daemon.request(socket_path, {**_payload("functions", str(tmp_path)), "command": "x"})
+
+    assert [f["name"] for f in result["functions"]] == ["one"]
+    assert "error" in error
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+from tree_sitter_mcp.cache import strip_nodes
+from tree_sitter_mcp.project import ProjectAnalyzer, _identifier_pattern, find_files
+
+
+def _write_project(root, count: int) -> None:
+    for i in range(count):
+        (root / f"mod{i}.py").write_text(
+            f"import os\n\n\nclass C{i}:\n    pass\n\n\n"
+            f"def func{i}(x):\n    return os.path.join(x, 'v')\n"
+        )
+
+
+def test_analyze_files_matches_per_view_getters(tmp_path):
+    _write_project(tmp_path, 2)
+    project = ProjectAnalyzer(str(tmp_path))
+
+    results = project.analyze_files()
+
+    assert sorted(results) == project.files
+    assert [f.name for r in results.values() for f in r["functions"]] == ["func0", "func1"]
+    assert [c.name for r in results.values() for c in r["classes"]] == ["C0", "C1"]
+    assert sum(len(r["imports"]) for r in results.values()) == 2
+    assert [s.value for s in results[project.files[0]]["strings"]] == ["'v'"]
+    assert [c.callee for r in results.values() for c in r["calls"]] == [
+        c.callee for c in project.get_calls()
+    ]
+
+
+def test_analyze_files_in_workers_matches_serial(tmp_path):
+    _write_project(tmp_path, ProjectAnalyzer.PARALLEL_MIN_FILES)
+    files = ProjectAnalyzer(str(tmp_path)).files
+
+    serial = ProjectAnalyzer(str(tmp_path), jobs=1).analyze_files(files[:3])
+    parallel = ProjectAnalyzer(str(tmp_path), jobs=2).analyze_files()
+
+    assert list(serial) == files[:3]
+    assert len(parallel) == ProjectAnalyzer.PARALLEL_MIN_FILES
+    for file_path, result in serial.items():
+        # Worker results come back without tree-sitter nodes
+        assert parallel[file_path] == {kind: strip_nodes(items) for kind, items in result.items()}
+
+
+def test_resident_analyzers_are_bounded(tmp_path, monkeypatch):
+    _write_project(tmp_path, 4)
+    monkeypatch.setattr(ProjectAnalyzer, "MAX_CACHED_ANALYZERS", 2)
+    project = ProjectAnalyzer(str(tmp_path))
+
+    for file_path in project.files:
+        project._get_analyzer(file_path)
+    # Touching the older entry keeps it over the one after it
+    project._get_analyzer(project.files[2])
+    project._get_analyzer(project.files[0])
+
+    assert list(project._analyzers) == [project.files[2], project.files[0]]
+
+
+def test_clear_drops_resident_state(tmp_path):
+    _write_project(tmp_path, 2)
+    project = ProjectAnalyzer(str(tmp_path))
+    project.get_sub_classes("C0")
+    project._file_contains_text(project.files[0], "func0")
+
+    project.clear()
+
+    assert not project._analyzers
+    assert not project._file_contents_cache
+    assert project._classes_by_name is None
+    assert [f.name for f in project.get_functions()] == ["func0", "func1"]
+
+
+@pytest.mark.parametrize(
+    ("name", "text", "found"),
+    [
+        ("run", b"run(x)", True),
+        ("run", b"x = run", True),
+        ("run", b"self.run()", True),
+        ("run", b"run_all()", False),
+        ("run", b"rerun()", False),
+        ("run", b"_run", False),
+        ("run", b"run2", False),
+        ("run", b"rerun(); run()", True),
+        ("caf\u00e9", "caf\u00e9()".encode(), True),
+        # Boundaries are ASCII-only, so non-ASCII neighbours err towards a match;
+        # the prefilter may admit extra files but never drops a real mention
+        ("caf\u00e9", "caf\u00e9s".encode(), True),
+        ("run", "\u00e9run".encode(), True),
+        # Non-word ends need no boundary
+        ("__init__", b"x.__init__()", True),
+        ("operator+", b"a.operator+=", True),
+    ],
+)
+def test_identifier_pattern(name, text, found):
+    assert (_identifier_pattern(name).search(text) is not None) is found
+
+
+def test_find_symbols_context(tmp_path):
+    (tmp_path / "a.py").write_text("def run(path):\n    return path\n\n\nrun_all = run\n")
+    (tmp_path / "b.py").write_text("def rerun():\n    pass\n")
+    project = ProjectAnalyzer(str(tmp_path))
+
+    with_context = project.find_symbols("run")
+    without_context = project.find_symbols("run", include_context=False)
+
+    assert [s["location"]["start_line"] for s in with_context] == [1, 5]
+    assert with_context[1]["context"] == "run_all = run"
+    assert without_context == [{k: v for k, v in s.items() if k != "context"} for s in with_context]
+
+
+def test_find_files_skips_dirs_and_dedups_symlinks(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "mod.py").write_text("x = 1\n")
+    (tmp_path / "notes.txt").write_text("x\n")
+    for skipped in (".git", "node_modules", "__pycache__"):
+        (tmp_path / skipped).mkdir()
+        (tmp_path / skipped / "hidden.py").write_text("x = 1\n")
+    os.symlink(tmp_path / "pkg" / "mod.py", tmp_path / "alias.py")
+    # Directory symlinks aren't followed, so a loop can't recurse
+    os.symlink(tmp_path, tmp_path / "pkg" / "loop")
+
+    assert find_files(str(tmp_path)) == [os.path.realpath(tmp_path / "pkg" / "mod.py")]
+    assert find_files(str(tmp_path), skipped_dirs=()) == sorted(
+        [os.path.realpath(tmp_path / "pkg" / "mod.py")]
+        + [
+            os.path.realpath(tmp_path / d / "hidden.py")
+            for d in (".git", "node_modules", "__pycache__")
+        ]
+    )
+
+
+def test_new_project_sees_changed_file(tmp_path):
+    path = tmp_path / "mod.py"
+    path.write_text("def old():\n    pass\n")
+    before = ProjectAnalyzer(str(tmp_path))
+    assert [f.name for f in before.get_functions()] == ["old"]
+
+    path.write_text("def new():\n    pass\n\n\ndef other():\n    pass\n")
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert [f.name for f in ProjectAnalyzer(str(tmp_path)).get_functions()] == ["new", "other"]
+    # The earlier project keeps its own analyzer rather than having it swapped underneath
+    assert [f.name for f in before.get_functions()] == ["old"]
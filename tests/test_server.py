@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+server = pytest.importorskip("tree_sitter_mcp.server", exc_type=ImportError)
+
+
+def test_unrelated_projects_build_concurrently(monkeypatch, tmp_path):
+    builds = []
+
+    class SlowProject:
+        def __init__(self, path, files=None):
+            builds.append(path)
+            self.files = files
+            time.sleep(0.3)
+
+    monkeypatch.setattr(server, "ProjectAnalyzer", SlowProject)
+    monkeypatch.setattr(server, "_projects", type(server._projects)())
+    paths = []
+    for name in ("first", "second"):
+        root = tmp_path / name
+        root.mkdir()
+        (root / "mod.py").write_text("def func():\n    pass\n")
+        paths.append(str(root))
+
+    threads = [threading.Thread(target=server._get_project, args=(p,)) for p in paths * 2]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(builds) == sorted(paths)
+    assert time.perf_counter() - start < 0.55
+    assert server._get_project(paths[0]).files == [f"{paths[0]}/mod.py"]